@@ -0,0 +1,40 @@
+"""
+.env → app/config_cached.py 컴파일 스크립트
+
+컨테이너 빌드 시점에 한 번 실행하여 .env 파싱 결과를 리터럴 대입으로 굳혀둔다.
+app/config.py는 이 모듈을 우선 import 하고, 캐시가 없거나 .env가 더 최신이면
+기존처럼 load_dotenv()로 되돌아간다.
+
+사용:
+    python -m app.build_config_cache
+"""
+import os
+from pathlib import Path
+
+from dotenv import dotenv_values, find_dotenv
+
+CACHE_PATH = Path(__file__).resolve().parent / "config_cached.py"
+
+
+def build_config_cache(dotenv_path: str = "") -> Path:
+    """.env 값을 config_cached.py로 기록하고 생성된 경로를 반환"""
+    # config.py의 load_dotenv()와 같은 기준(app/ 에서 상위로 탐색)으로 .env를 찾음
+    dotenv_path = dotenv_path or find_dotenv()
+    values = {k: v for k, v in dotenv_values(dotenv_path).items() if v is not None} if dotenv_path else {}
+    mtime = os.path.getmtime(dotenv_path) if dotenv_path else 0.0
+
+    lines = [
+        "# 자동 생성 파일 - 직접 수정하지 마세요 (python -m app.build_config_cache)",
+        f"DOTENV_PATH = {dotenv_path!r}",
+        f"DOTENV_MTIME = {mtime!r}",
+        "DOTENV_VALUES = {",
+        *(f"    {k!r}: {v!r}," for k, v in values.items()),
+        "}",
+        "",
+    ]
+    CACHE_PATH.write_text("\n".join(lines), encoding="utf-8")
+    return CACHE_PATH
+
+
+if __name__ == "__main__":
+    print(f"Config cache written: {build_config_cache()}")
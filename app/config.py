@@ -1,7 +1,34 @@
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+
+def _load_env() -> None:
+    """환경변수 로드: 컴파일된 config_cached 우선, 없거나 오래되면 .env 파싱"""
+    if os.getenv("CONFIG_CACHE_DISABLED", "false").lower() not in ("1", "true", "yes", "y"):
+        try:
+            from . import config_cached
+        except ImportError:
+            config_cached = None
+        if config_cached is not None and _cache_is_fresh(config_cached):
+            # load_dotenv(override=False)와 동일하게 기존 환경변수를 덮어쓰지 않음
+            for key, value in config_cached.DOTENV_VALUES.items():
+                os.environ.setdefault(key, value)
+            return
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+def _cache_is_fresh(cache) -> bool:
+    path = getattr(cache, "DOTENV_PATH", "")
+    if not path:
+        return True
+    try:
+        return os.path.getmtime(path) <= cache.DOTENV_MTIME
+    except OSError:
+        return False
+
+
+_load_env()
 
 GITHUB_CLIENT_ID = os.getenv("GITHUB_CLIENT_ID")
 GITHUB_CLIENT_SECRET = os.getenv("GITHUB_CLIENT_SECRET")
@@ -11,5 +38,8 @@ GITHUB_TOKEN_URL = "https://github.com/login/oauth/access_token"
 GITHUB_API_URL = "https://api.github.com/user"
 GITHUB_WEBHOOK_SECRET = os.getenv("GITHUB_WEBHOOK_SECRET", "default_webhook_secret")
 
+# 채팅 세션 저장소 (설정 시 Redis, 미설정 시 프로세스 메모리)
+REDIS_URL = os.getenv("REDIS_URL")
+
 # LangGraph/LangChain 문서 생성 모드 (mock 사용 여부)
-LANGGRAPH_USE_MOCK = str(os.getenv("LANGGRAPH_USE_MOCK", "false")).lower() in ("1", "true", "yes", "y")
\ No newline at end of file
+LANGGRAPH_USE_MOCK = str(os.getenv("LANGGRAPH_USE_MOCK", "false")).lower() in ("1", "true", "yes", "y")
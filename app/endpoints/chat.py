@@ -1,35 +1,26 @@
+# 요청 간 커넥션 풀을 재사용하는 비동기 OpenAI 클라이언트 (이벤트 루프를 막지 않음)
+client = openai.AsyncOpenAI(api_key=OPENAI_API_KEY)
+
+
 @router.post("/", response_model=ChatResponse)
 async def chat_endpoint(request: ChatRequest):
     try:
         # 세션 가져오기 또는 생성
-        session_id = get_or_create_session(request.session_id)
+        session_id = await get_or_create_session(request.session_id)
 
-        # 사용자 메시지를 대화 히스토리에 추가
-        conversation_store[session_id]['messages'].append({
-            "role": "user",
-            "content": request.message
-        })
-
-        conversation_store[session_id]['messages'][0]["content"] = request.system_message
+        # 사용자 메시지를 대화 히스토리에 추가 (최근 대화만 유지: 시스템 메시지 + 최근 20턴)
+        await set_system_message(session_id, request.system_message)
+        await append_message(session_id, "user", request.message)
 
         # OpenAI API 호출
-        response = openai.ChatCompletion.create(
+        response = await client.chat.completions.create(
             model=MODEL,
-            messages=conversation_store[session_id]['messages']
+            messages=await get_messages(session_id)
         )
-        assistant_response = response['choices'][0]['message']['content']
+        assistant_response = response.choices[0].message.content
 
         # 어시스턴트 응답을 대화 히스토리에 추가
-        conversation_store[session_id]['messages'].append({
-            "role": "assistant",
-            "content": assistant_response
-        })
-
-        # 대화 히스토리가 너무 길어지면 최근 대화만 유지 (시스템 메시지 + 최근 20턴)
-        if len(conversation_store[session_id]['messages']) > 41:
-            system_msg = conversation_store[session_id]['messages'][0]
-            recent_messages = conversation_store[session_id]['messages'][-40:]
-            conversation_store[session_id]['messages'] = [system_msg] + recent_messages
+        await append_message(session_id, "assistant", assistant_response)
         return ChatResponse(response=assistant_response, session_id=session_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
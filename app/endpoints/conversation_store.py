@@ -0,0 +1,94 @@
+"""
+대화 세션 저장소
+
+REDIS_URL이 설정되어 있으면 세션을 Redis에 저장한다.
+    - chat:{session_id}:msgs  사용자/어시스턴트 메시지 리스트 (JSON 문자열)
+    - chat:{session_id}:sys   시스템 메시지
+추가는 RPUSH, 최근 대화 유지는 LTRIM으로 서버 측에서 처리하므로 여러 워커가 세션을 공유할 수 있다.
+REDIS_URL이 없으면 기존처럼 프로세스 메모리(conversation_store)를 사용한다.
+"""
+import json
+import uuid
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from app.config import REDIS_URL
+
+# 시스템 메시지를 제외하고 유지할 최근 메시지 수 (20턴)
+MAX_HISTORY_MESSAGES = 40
+
+# 인메모리 백엔드: {session_id: {"system": str, "messages": deque(maxlen=MAX_HISTORY_MESSAGES)}}
+# deque가 가득 차면 append 시 가장 오래된 메시지가 자동으로 빠진다.
+conversation_store: Dict[str, Dict[str, Any]] = {}
+
+_redis = None
+if REDIS_URL:
+    import redis.asyncio as redis
+
+    _redis = redis.from_url(REDIS_URL, decode_responses=True)
+
+
+def _msgs_key(session_id: str) -> str:
+    return f"chat:{session_id}:msgs"
+
+
+def _sys_key(session_id: str) -> str:
+    return f"chat:{session_id}:sys"
+
+
+async def session_exists(session_id: str) -> bool:
+    if _redis is not None:
+        return bool(await _redis.exists(_sys_key(session_id)))
+    return session_id in conversation_store
+
+
+async def get_or_create_session(session_id: Optional[str]) -> str:
+    """기존 세션이 있으면 그대로, 없으면 새 세션 생성"""
+    if session_id and await session_exists(session_id):
+        return session_id
+
+    new_id = str(uuid.uuid4())
+    if _redis is not None:
+        await _redis.set(_sys_key(new_id), "")
+    else:
+        conversation_store[new_id] = {"system": "", "messages": deque(maxlen=MAX_HISTORY_MESSAGES)}
+    return new_id
+
+
+async def set_system_message(session_id: str, content: str) -> None:
+    if _redis is not None:
+        await _redis.set(_sys_key(session_id), content)
+    else:
+        conversation_store[session_id]["system"] = content
+
+
+async def append_message(session_id: str, role: str, content: str) -> None:
+    """메시지 추가 후 최근 MAX_HISTORY_MESSAGES개만 유지"""
+    message = {"role": role, "content": content}
+    if _redis is not None:
+        async with _redis.pipeline(transaction=True) as pipe:
+            pipe.rpush(_msgs_key(session_id), json.dumps(message, ensure_ascii=False))
+            pipe.ltrim(_msgs_key(session_id), -MAX_HISTORY_MESSAGES, -1)
+            await pipe.execute()
+        return
+
+    conversation_store[session_id]["messages"].append(message)
+
+
+async def get_messages(session_id: str) -> List[Dict[str, str]]:
+    """OpenAI 요청용 메시지 목록 (시스템 메시지 + 최근 대화)"""
+    if _redis is not None:
+        async with _redis.pipeline(transaction=False) as pipe:
+            pipe.get(_sys_key(session_id))
+            pipe.lrange(_msgs_key(session_id), 0, -1)
+            system_content, raw_messages = await pipe.execute()
+        return [{"role": "system", "content": system_content or ""}] + [json.loads(m) for m in raw_messages]
+    session = conversation_store[session_id]
+    return [{"role": "system", "content": session["system"]}, *session["messages"]]
+
+
+async def remove_session(session_id: str) -> bool:
+    """세션 삭제. 존재하지 않으면 False"""
+    if _redis is not None:
+        return bool(await _redis.delete(_sys_key(session_id), _msgs_key(session_id)))
+    return conversation_store.pop(session_id, None) is not None
@@ -1,15 +1,29 @@
+import atexit
+import functools
 import logging
+import logging.handlers
 import sys
 import os
+import queue
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Union
+from typing import List, Optional, Union
 
 
 # 로깅 설정 모듈
 
+# 파일 로그 버퍼링 설정: capacity개가 쌓이거나 주기마다 한 번에 기록 (ERROR 이상은 즉시)
+LOG_BUFFER_CAPACITY = int(os.getenv("LOG_BUFFER_CAPACITY", "512"))
+LOG_FLUSH_INTERVAL_SECONDS = float(os.getenv("LOG_FLUSH_INTERVAL_SECONDS", "0.2"))
+
 class ColoredFormatter(logging.Formatter):
-    """컬러 포맷터 (콘솔용)"""
+    """컬러 포맷터 (콘솔용)
+
+    record.levelname을 직접 바꾸면 같은 레코드를 받는 다른 핸들러(파일 등)에도
+    색상 코드가 섞이므로, 별도 키(%(coloredlevel)s)로 전달한다.
+    레벨별 색상 문자열은 미리 만들어 두고 레코드마다 dict 조회 한 번만 한다.
+    """
 
     COLORS = {
         'DEBUG': '\033[36m',  # 청록색
@@ -20,12 +34,20 @@ class ColoredFormatter(logging.Formatter):
     }
     RESET = '\033[0m'
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._level_labels = {name: f"{color}{name}{self.RESET}" for name, color in self.COLORS.items()}
+
     def format(self, record):
-        log_color = self.COLORS.get(record.levelname, self.RESET)
-        record.levelname = f"{log_color}{record.levelname}{self.RESET}"
+        record.coloredlevel = self._level_labels.get(record.levelname, record.levelname)
         return super().format(record)
 
 
+def _use_color() -> bool:
+    """콘솔이 TTY이고 NO_COLOR가 설정되지 않았을 때만 컬러 출력"""
+    return sys.stdout.isatty() and os.getenv("NO_COLOR") is None
+
+
 def setup_logging(log_level: str = "INFO", log_file: Optional[str] = None) -> logging.Logger:
     """
     로깅 시스템 설정
@@ -52,27 +74,43 @@ def setup_logging(log_level: str = "INFO", log_file: Optional[str] = None) -> lo
     logger = logging.getLogger("CICDAutoDoc")
     logger.setLevel(level)
 
-    # 기존 핸들러 제거 (중복 방지)
+    # 기존 핸들러/리스너 제거 (중복 방지)
+    shutdown_logging()
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
+        handler.close()
 
     # 포맷터 설정
     file_formatter = logging.Formatter(
-        fmt='%(asctime)s - %(name)s - %(levelname)s - %(module)s:%(lineno)d - %(message)s',
+        fmt='%(asctime)s - %(name)s - %(levelname)s - %(threadName)s - %(module)s:%(lineno)d - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
 
-    console_formatter = ColoredFormatter(
-        fmt='%(asctime)s - %(levelname)s - %(module)s:%(lineno)d - %(message)s',
-        datefmt='%H:%M:%S'
-    )
+    # 파일/파이프로 리다이렉트된 경우 ANSI 코드가 섞이지 않도록 일반 포맷터 사용
+    if _use_color():
+        console_formatter = ColoredFormatter(
+            fmt='%(asctime)s - %(coloredlevel)s - %(threadName)s - %(module)s:%(lineno)d - %(message)s',
+            datefmt='%H:%M:%S'
+        )
+    else:
+        console_formatter = file_formatter
 
-    # 파일 핸들러 (모든 로그)
+    target_handlers: List[logging.Handler] = []
+
+    # 파일 핸들러 (모든 로그) - 레코드마다 write() 하지 않도록 MemoryHandler로 묶어서 기록
     try:
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
+        buffered_handler = logging.handlers.MemoryHandler(
+            capacity=LOG_BUFFER_CAPACITY,
+            flushLevel=logging.ERROR,
+            target=file_handler,
+            flushOnClose=True,
+        )
+        buffered_handler.setLevel(logging.DEBUG)
+        target_handlers.append(buffered_handler)
+        _start_periodic_flush(buffered_handler)
     except Exception as e:
         print(f"Warning: Failed to setup file logging: {e}")
 
@@ -80,25 +118,94 @@ def setup_logging(log_level: str = "INFO", log_file: Optional[str] = None) -> lo
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(level)
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
+    target_handlers.append(console_handler)
+
+    # 요청 경로에서는 메시지만 확정해 큐에 넣고, 파일·콘솔 I/O는 리스너 스레드가 처리
+    # (기본 QueueHandler.prepare가 msg/args를 호출 시점 값으로 고정 -> 이후 args가 변경돼도 로그가 바뀌지 않음)
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _start_queue_listener(log_queue, target_handlers)
 
     # 초기 로그
     logger.info("Logging system initialized", extra={
         "log_level": log_level,
         "log_file": str(log_file),
-        "handlers": len(logger.handlers)
+        "handlers": len(target_handlers)
     })
 
     return logger
 
 
-# 전역 로거 인스턴스
-_logger = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _start_queue_listener(log_queue: "queue.SimpleQueue[logging.LogRecord]",
+                          handlers: List[logging.Handler]) -> None:
+    global _listener
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """큐에 남은 레코드를 모두 기록하고 리스너/flusher 스레드 정리 (앱 종료 시 호출)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    _stop_periodic_flush()
+
 
+atexit.register(shutdown_logging)
 
+
+class _PeriodicFlusher(threading.Thread):
+    """버퍼 핸들러를 일정 주기로 flush 하는 데몬 스레드"""
+
+    def __init__(self, handler: logging.handlers.MemoryHandler, interval: float):
+        super().__init__(name="log-flusher", daemon=True)
+        self.handler = handler
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.handler.flush()
+
+    def stop(self):
+        self.stopped.set()
+        self.handler.flush()
+
+
+_flusher: Optional[_PeriodicFlusher] = None
+
+
+def _start_periodic_flush(handler: logging.handlers.MemoryHandler) -> None:
+    """이전 flusher를 정리하고 새 버퍼 핸들러용 flusher 시작"""
+    global _flusher
+    _stop_periodic_flush()
+    _flusher = _PeriodicFlusher(handler, LOG_FLUSH_INTERVAL_SECONDS)
+    _flusher.start()
+
+
+def _stop_periodic_flush() -> None:
+    global _flusher
+    if _flusher is not None:
+        _flusher.stop()
+        _flusher = None
+
+
+@functools.cache
+def _root_logger() -> logging.Logger:
+    """최초 호출 시 한 번만 setup_logging()을 수행하고 루트 로거를 캐시"""
+    return setup_logging()
+
+
+@functools.cache
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     """
-    로거 인스턴스 반환
+    로거 인스턴스 반환 (이름별로 캐시되어 재호출 시 getChild 조회를 생략)
 
     Args:
         name: 로거 이름 (모듈명 등)
@@ -106,20 +213,24 @@ def get_logger(name: Optional[str] = None) -> logging.Logger:
     Returns:
         로거 인스턴스
     """
-    global _logger
-    if _logger is None:
-        _logger = setup_logging()
+    root = _root_logger()
+    return root.getChild(name) if name else root
+
 
-    if name:
-        return _logger.getChild(name)
-    return _logger
+# 편의 함수용 자식 로거 (호출마다 getLogger 조회/락을 타지 않도록 import 시 한 번만 생성)
+_WEBHOOK_LOGGER = get_logger("webhook")
+_DOCUMENT_LOGGER = get_logger("document")
+_GITHUB_API_LOGGER = get_logger("github_api")
+_ERROR_LOGGER = get_logger("error")
 
 
 # 편의 함수들
 def log_webhook_event(event_type: str, repository: str, **kwargs):
     """웹훅 이벤트 로깅"""
-    logger = get_logger("webhook")
-    logger.info(f"Webhook received: {event_type}", extra={
+    # 레벨이 꺼져 있으면 extra dict 생성/kwargs 병합 자체를 건너뜀
+    if not _WEBHOOK_LOGGER.isEnabledFor(logging.INFO):
+        return
+    _WEBHOOK_LOGGER.info("Webhook received: %s", event_type, extra={
         "event_type": event_type,
         "repository": repository,
         **kwargs
@@ -128,8 +239,9 @@ def log_webhook_event(event_type: str, repository: str, **kwargs):
 
 def log_document_generation(code_change_id: int, status: str, **kwargs):
     """문서 생성 로깅"""
-    logger = get_logger("document")
-    logger.info(f"Document generation {status}", extra={
+    if not _DOCUMENT_LOGGER.isEnabledFor(logging.INFO):
+        return
+    _DOCUMENT_LOGGER.info("Document generation %s", status, extra={
         "code_change_id": code_change_id,
         "status": status,
         **kwargs
@@ -138,8 +250,9 @@ def log_document_generation(code_change_id: int, status: str, **kwargs):
 
 def log_github_api_call(url: str, status_code: int, **kwargs):
     """GitHub API 호출 로깅"""
-    logger = get_logger("github_api")
-    logger.info(f"GitHub API call: {status_code}", extra={
+    if not _GITHUB_API_LOGGER.isEnabledFor(logging.INFO):
+        return
+    _GITHUB_API_LOGGER.info("GitHub API call: %s", status_code, extra={
         "url": url,
         "status_code": status_code,
         **kwargs
@@ -148,15 +261,16 @@ def log_github_api_call(url: str, status_code: int, **kwargs):
 
 def log_error(message: str, error: Optional[Exception] = None, **kwargs):
     """에러 로깅"""
-    logger = get_logger("error")
+    if not _ERROR_LOGGER.isEnabledFor(logging.ERROR):
+        return
     if error:
-        logger.error(f"{message}: {str(error)}", extra={
+        _ERROR_LOGGER.error("%s: %s", message, error, extra={
             "error_type": type(error).__name__,
             "error_message": str(error),
             **kwargs
         }, exc_info=True)
     else:
-        logger.error(message, extra=kwargs)
+        _ERROR_LOGGER.error(message, extra=kwargs)
 
 
 # 개발환경용 설정
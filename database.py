@@ -1,13 +1,24 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./backend.db"
 
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    # 동시 워크플로우 실행마다 커넥션을 새로 열지 않도록 풀 크기 확보
+    pool_size=16,
+    max_overflow=16,
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# 비동기 세션 (LangGraph 노드 등 이벤트 루프 위에서 DB 대기를 양보해야 하는 경로용)
+ASYNC_SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./backend.db"
+
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
@@ -17,4 +28,17 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def ensure_indexes():
+    """모델에 선언된 인덱스 중 기존 DB에 없는 것을 생성 (CREATE INDEX IF NOT EXISTS와 동일, 앱 시작 시 호출)
+
+    스키마 마이그레이션 도구를 쓰지 않으므로 이미 만들어진 DB에도 새 인덱스가 반영되도록 함.
+    테이블 자체가 아직 없는 경우는 건너뜀.
+    """
+    existing_tables = set(inspect(engine).get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
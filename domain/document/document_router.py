@@ -25,24 +25,42 @@ LangGraph 기반 자동 문서 생성 시스템의 문서 관리 API입니다.
 """
 
 from fastapi import APIRouter, HTTPException, Depends, Query, Body
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session, load_only, selectinload, joinedload
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
+from itertools import chain, islice
 import os
 
-from .schema import DocumentResponse, DocumentUpdate
+from .schema import DocumentResponse, DocumentUpdate, DocumentStatus, DOCUMENT_RESPONSE_FIELDS
 from database import get_db
 from models import Document, CodeChange, User
 from app.logging_config import get_logger
 
 import httpx
 import base64
+import binascii
 from app.config import GITHUB_API_URL
 
 logger = get_logger("document_router")
+
+# 목록 스트리밍 시 DB에서 한 번에 가져오는 행 수
+LIST_STREAM_CHUNK_SIZE = 20
+
+# GitHub API 공용 클라이언트: 요청마다 TLS 연결을 새로 맺지 않도록 HTTP/2 + keep-alive 풀 재사용
+# (앱 종료 시 main.py lifespan에서 닫음)
+GITHUB_CLIENT = httpx.AsyncClient(
+    base_url="https://api.github.com",
+    http2=True,
+    timeout=30.0,
+    limits=httpx.Limits(max_keepalive_connections=50),
+)
 router = APIRouter(
     prefix="/documents", 
     tags=["Documents"],
+    default_response_class=ORJSONResponse,  # datetime 등을 C 레벨에서 직렬화
     responses={
         500: {"description": "Internal server error"},
         401: {"description": "Authentication required"},
@@ -101,11 +119,11 @@ async def read_document(document_id: int, db: Session = Depends(get_db)):
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
         
-        logger.info(f"Document retrieved: {document_id}")
+        logger.info("Document retrieved: %s", document_id)
         return DocumentResponse.model_validate(document)
         
     except Exception as e:
-        logger.error(f"Error retrieving document {document_id}: {e}")
+        logger.error("Error retrieving document %s: %s", document_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -211,27 +229,33 @@ async def update_document(
         if not update_data:
             raise HTTPException(status_code=400, detail="No fields to update")
 
-        # 3. 문서 업데이트
-        for field, value in update_data.items():
-            if hasattr(document, field):
-                setattr(document, field, value)
+        # 3. 실제로 값이 바뀌는 필드만 추림 - 없으면 커밋/refresh 없이 현재 문서를 그대로 반환 (멱등 재시도)
+        changed = {
+            field: value for field, value in update_data.items()
+            if hasattr(document, field) and getattr(document, field) != value
+        }
+        if not changed:
+            logger.info("Document unchanged: %s", document_id)
+            return DocumentResponse.model_validate(document)
 
-        # 4. content가 변경되면 자동으로 상태를 'edited'로 변경
-        if "content" in update_data and "status" not in update_data:
-            setattr(document, 'status', 'edited')
+        for field, value in changed.items():
+            setattr(document, field, value)
 
-        setattr(document, 'updated_at', datetime.utcnow())
+        # 4. content가 변경되면 자동으로 상태를 'edited'로 변경
+        if "content" in changed:
+            if "status" not in update_data:
+                setattr(document, 'status', 'edited')
 
         # 5. DB 저장
         db.commit()
         db.refresh(document)
 
-        logger.info(f"Document updated: {document_id}")
+        logger.info("Document updated: %s", document_id)
         return DocumentResponse.model_validate(document)
 
     except Exception as e:
         db.rollback()
-        logger.error(f"Error updating document {document_id}: {e}")
+        logger.error("Error updating document %s: %s", document_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -275,14 +299,14 @@ async def list_documents(
         description="저장소 전체 이름 (format: `owner/repo`)",
         example="user/my-project"
     ),
-    status: Optional[str] = Query(
+    status: Optional[DocumentStatus] = Query(
         None,
         description="문서 상태",
-        enum=["generated", "edited", "reviewed", "failed"],
         example="generated"
     ),
     limit: int = Query(50, ge=1, le=100, description="조회 개수"),
-    offset: int = Query(0, ge=0, description="시작 위치"),
+    offset: int = Query(0, ge=0, description="시작 위치 (cursor 미사용 시에만 적용)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 `X-Next-Cursor` 헤더 값"),
     db: Session = Depends(get_db)
 ):
     """
@@ -300,7 +324,10 @@ async def list_documents(
 
     ### 페이징 옵션
     - **limit**: 한 번에 가져올 문서 수 (기본값: 50, 최대: 100)
-    - **offset**: 건너뛸 문서 수 (페이징을 위한 시작점)
+    - **cursor**: 다음 페이지 커서 (권장). 응답 헤더 `X-Next-Cursor` 값을 그대로 전달하면
+      앞 페이지 행을 다시 읽지 않고 이어서 조회합니다 (keyset pagination)
+    - **offset**: 건너뛸 문서 수 (cursor가 없을 때만 사용, 깊은 페이지에서는 느림).
+      첫 페이지(offset=0)에서 받은 `X-Next-Cursor`로 이어 조회하는 것을 권장
 
     ### 사용 예시
     - 관리자 대시보드에서 전체 문서 목록 확인
@@ -308,10 +335,13 @@ async def list_documents(
     - 페이징으로 대용량 문서 목록 처리
 
     ### 정렬
-    - 최신 생성 순으로 정렬됩니다 (created_at DESC)
+    - 최신 생성 순으로 정렬됩니다 (created_at DESC, id DESC)
     """
     try:
-        query = db.query(Document)
+        # 응답에 필요한 컬럼만 로드 (generation_metadata 등 제외)
+        query = db.query(Document).options(
+            load_only(*(getattr(Document, field) for field in DOCUMENT_RESPONSE_FIELDS))
+        )
 
         # 필터 적용
         if repository_name:
@@ -320,17 +350,74 @@ async def list_documents(
         if status:
             query = query.filter(Document.status == status)
 
-        # 정렬 및 페이징
-        documents = query.order_by(Document.created_at.desc()).offset(offset).limit(limit).all()
-
-        logger.info(f"Documents listed: {len(documents)} items")
-        return [DocumentResponse.model_validate(doc) for doc in documents]
+        # 정렬 및 페이징: cursor가 있으면 (created_at, id) 기준 keyset, 없으면 offset
+        query = query.order_by(Document.created_at.desc(), Document.id.desc())
+        if cursor:
+            query = query.filter(tuple_(Document.created_at, Document.id) < _decode_cursor(cursor))
+            offset = 0
+
+        documents = iter(query.offset(offset).limit(limit).yield_per(LIST_STREAM_CHUNK_SIZE))
+        # 첫 청크는 응답 시작 전에 조회/검증 -> 쿼리·스키마 오류가 200 + 잘린 JSON이 아닌 5xx로 반환됨
+        first_rows = list(islice(documents, LIST_STREAM_CHUNK_SIZE))
+        first_chunk = [_serialize_document(doc) for doc in first_rows]
+
+        # 스트리밍 시작 후에는 헤더를 바꿀 수 없으므로 커서는 응답 전에 계산
+        headers = {}
+        if len(first_rows) == limit:
+            # 페이지 전체가 첫 청크에 들어옴 -> 추가 조회 없이 마지막 행으로 커서 계산
+            headers["X-Next-Cursor"] = _encode_cursor(first_rows[-1].created_at, first_rows[-1].id)
+        elif len(first_rows) == LIST_STREAM_CHUNK_SIZE and (cursor or offset == 0):
+            # 페이지가 청크보다 길면 마지막 행의 키만 따로 조회
+            # (깊은 offset 페이지에서는 OFFSET 스캔을 한 번 더 하게 되므로 생략 - 첫 페이지/cursor 요청에서만 발급)
+            boundary = (
+                query.with_entities(Document.created_at, Document.id)
+                .offset(offset + limit - 1)
+                .limit(1)
+                .first()
+            )
+            if boundary:
+                headers["X-Next-Cursor"] = _encode_cursor(*boundary)
+        return StreamingResponse(
+            _stream_documents(first_chunk, documents), media_type="application/json", headers=headers
+        )
 
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error listing documents: {e}")
+        logger.error("Error listing documents: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _encode_cursor(created_at: datetime, doc_id: int) -> str:
+    """마지막 행의 (created_at, id)를 URL-safe 커서 문자열로 인코딩"""
+    raw = f"{created_at.isoformat()}|{doc_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _serialize_document(doc: Document) -> bytes:
+    """response_model과 같은 검증/직렬화를 거치도록 DocumentResponse 스키마로 행 하나를 JSON 직렬화"""
+    return DocumentResponse.model_validate(doc).model_dump_json().encode("utf-8")
+
+
+def _stream_documents(first_chunk: List[bytes], documents: Iterator[Document]) -> Iterator[bytes]:
+    """미리 직렬화한 첫 청크 뒤로 yield_per 나머지 행을 JSON 배열 조각으로 내보냄 (전체 목록을 메모리에 만들지 않음)"""
+    count = 0
+    yield b"["
+    for row in chain(first_chunk, map(_serialize_document, documents)):
+        yield (b"," if count else b"") + row
+        count += 1
+    yield b"]"
+    logger.info("Documents listed: %d items", count)
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    try:
+        created_at, doc_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(doc_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.post(
     "/trigger/{code_change_id}",
     summary="문서 생성 트리거",
@@ -398,14 +485,23 @@ async def trigger_document_generation(
     - 501: 문서 생성 서비스가 아직 구현되지 않음 (개발 중)
     """
     try:
-        # 1. 코드 변경사항 확인
-        code_change = db.query(CodeChange).filter(CodeChange.id == code_change_id).first()
+        # 1. 코드 변경사항 확인 (repository, document, file_changes를 함께 로드)
+        code_change = (
+            db.query(CodeChange)
+            .options(
+                joinedload(CodeChange.repository),
+                joinedload(CodeChange.document),
+                selectinload(CodeChange.file_changes),
+            )
+            .filter(CodeChange.id == code_change_id)
+            .first()
+        )
         
         if not code_change:
             raise HTTPException(status_code=404, detail="CodeChange not found")
         
         # 2. 기존 문서 확인 (중복 생성 방지)
-        existing_doc = db.query(Document).filter(Document.code_change_id == code_change_id).first()
+        existing_doc = code_change.document
         
         if existing_doc:
             return {
@@ -443,7 +539,7 @@ async def trigger_document_generation(
             raise HTTPException(status_code=500, detail=result["error"])
             
     except Exception as e:
-        logger.error(f"Error triggering document generation for CodeChange {code_change_id}: {e}")
+        logger.error("Error triggering document generation for CodeChange %s: %s", code_change_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -495,12 +591,12 @@ async def delete_document(document_id: int, db: Session = Depends(get_db)):
         db.delete(document)
         db.commit()
         
-        logger.info(f"Document deleted: {document_id}")
+        logger.info("Document deleted: %s", document_id)
         return {"message": "Document deleted successfully"}
         
     except Exception as e:
         db.rollback()
-        logger.error(f"Error deleting document {document_id}: {e}")
+        logger.error("Error deleting document %s: %s", document_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -518,14 +614,15 @@ async def get_latest_document(
         document = (
             db.query(Document)
             .filter(Document.repository_name == repository_full_name)
-            .order_by(Document.updated_at.desc())
+            .order_by(Document.updated_at.desc(), Document.id.desc())
             .first()
         )
         if not document:
             raise HTTPException(status_code=404, detail="Document not found for repository")
 
         logger.info(
-            f"Latest document retrieved for repo: {repository_full_name}",
+            "Latest document retrieved for repo: %s",
+            repository_full_name,
             extra={"repository_name": repository_full_name, "document_id": document.id},
         )
         return DocumentResponse.model_validate(document)
@@ -533,12 +630,51 @@ async def get_latest_document(
         raise
     except Exception as e:
         logger.error(
-            f"Error retrieving latest document for repository {repository_full_name}: {e}",
+            "Error retrieving latest document for repository %s: %s",
+            repository_full_name,
+            e,
             extra={"repository_name": repository_full_name},
         )
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# (repo_full_name, branch) -> 마지막으로 발행한 README.md blob sha
+# 재발행 시 GET 없이 PUT 한 번으로 끝내기 위해 사용 (불일치 시 조회 후 재시도)
+# 저장소/브랜치 수만큼 무한히 늘지 않도록 LRU로 크기 제한 (0 이하면 캐시 비활성)
+_README_SHA_CACHE_SIZE = int(os.getenv("README_SHA_CACHE_SIZE", "1024"))
+_readme_sha_cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+
+def _readme_sha_cache_get(key: Tuple[str, str]) -> Optional[str]:
+    sha = _readme_sha_cache.get(key)
+    if sha is not None:
+        _readme_sha_cache.move_to_end(key)
+    return sha
+
+
+def _readme_sha_cache_put(key: Tuple[str, str], sha: str) -> None:
+    if _README_SHA_CACHE_SIZE <= 0:
+        return
+    _readme_sha_cache[key] = sha
+    _readme_sha_cache.move_to_end(key)
+    while len(_readme_sha_cache) > _README_SHA_CACHE_SIZE:
+        _readme_sha_cache.popitem(last=False)
+
+
+async def _fetch_readme_sha(url: str, headers: Dict[str, str], branch: str) -> Optional[str]:
+    """기존 README.md의 sha 조회 (없으면 None)"""
+    get_response = await GITHUB_CLIENT.get(url, headers=headers, params={"ref": branch})
+    if get_response.status_code == 200:
+        return get_response.json().get("sha")
+    if get_response.status_code == 404:
+        return None  # 파일이 없으면 생성
+    # 권한 문제 등 다른 에러
+    raise HTTPException(
+        status_code=get_response.status_code,
+        detail=f"Failed to check README: {get_response.text}"
+    )
+
+
 @router.post(
     "/{document_id}/publish",
     summary="GitHub README로 발행",
@@ -584,65 +720,62 @@ async def publish_document_to_github(
 
         access_token = user.access_token
 
-        # 3. GitHub API 호출
-        async with httpx.AsyncClient() as client:
-            headers = {
-                "Authorization": f"token {access_token}",
-                "Accept": "application/vnd.github.v3+json"
-            }
-
-            file_path = "README.md"
-            base_url = "https://api.github.com"
-            url = f"{base_url}/repos/{repo_full_name}/contents/{file_path}"
-
-            # 3-1. 기존 파일 확인 (SHA 값 획득용)
-            get_response = await client.get(url, headers=headers, params={"ref": branch})
-            sha = None
-
-            if get_response.status_code == 200:
-                file_data = get_response.json()
-                sha = file_data.get("sha")
-            elif get_response.status_code == 404:
-                pass  # 파일이 없으면 생성
-            else:
-                # 권한 문제 등 다른 에러
-                raise HTTPException(
-                    status_code=get_response.status_code,
-                    detail=f"Failed to check README: {get_response.text}"
-                )
-
-            # 3-2. 파일 내용 인코딩 (GitHub API는 Base64 요구)
-            content_bytes = document.content.encode('utf-8')
-            content_base64 = base64.b64encode(content_bytes).decode('utf-8')
-
-            # 3-3. PUT 요청 (생성/수정)
-            payload = {
-                "message": message,
-                "content": content_base64,
-                "branch": branch
-            }
+        # 3. GitHub API 호출 (모듈 공용 클라이언트로 연결 재사용)
+        headers = {
+            "Authorization": f"token {access_token}",
+            "Accept": "application/vnd.github.v3+json"
+        }
+
+        file_path = "README.md"
+        url = f"/repos/{repo_full_name}/contents/{file_path}"
+
+        # 3-1. 파일 내용 인코딩 (GitHub API는 Base64 요구)
+        content_base64 = binascii.b2a_base64(document.content.encode('utf-8'), newline=False).decode('ascii')
+
+        # 3-2. PUT 요청 (생성/수정) - 이전 발행에서 받은 sha로 바로 시도
+        cache_key = (repo_full_name, branch)
+        payload = {
+            "message": message,
+            "content": content_base64,
+            "branch": branch
+        }
+        sha = _readme_sha_cache_get(cache_key)
+        if sha:
+            payload["sha"] = sha  # 업데이트 시 필수
+
+        put_response = await GITHUB_CLIENT.put(url, headers=headers, json=payload)
+
+        # 3-3. sha 누락(422)/불일치(409)일 때만 기존 파일 sha를 조회해 한 번 재시도
+        if put_response.status_code in (409, 422):
+            sha = await _fetch_readme_sha(url, headers, branch)
+            payload.pop("sha", None)
             if sha:
-                payload["sha"] = sha  # 업데이트 시 필수
+                payload["sha"] = sha
+            put_response = await GITHUB_CLIENT.put(url, headers=headers, json=payload)
 
-            put_response = await client.put(url, headers=headers, json=payload)
+        if put_response.status_code not in [200, 201]:
+            _readme_sha_cache.pop(cache_key, None)
+            error_detail = put_response.json()
+            raise HTTPException(
+                status_code=put_response.status_code,
+                detail=f"Commit failed: {error_detail.get('message')}"
+            )
 
-            if put_response.status_code not in [200, 201]:
-                error_detail = put_response.json()
-                raise HTTPException(
-                    status_code=put_response.status_code,
-                    detail=f"Commit failed: {error_detail.get('message')}"
-                )
+        put_data = put_response.json()
+        new_sha = (put_data.get("content") or {}).get("sha")
+        if new_sha:
+            _readme_sha_cache_put(cache_key, new_sha)
 
-            commit_data = put_response.json().get("commit", {})
+        commit_data = put_data.get("commit", {})
 
-            logger.info(f"Document {document_id} published to {repo_full_name}")
+        logger.info("Document %s published to %s", document_id, repo_full_name)
 
-            return {
-                "success": True,
-                "message": f"Successfully published to {repo_full_name}/README.md",
-                "commit_sha": commit_data.get("sha")
-            }
+        return {
+            "success": True,
+            "message": f"Successfully published to {repo_full_name}/README.md",
+            "commit_sha": commit_data.get("sha")
+        }
 
     except Exception as e:
-        logger.error(f"Error publishing document {document_id}: {e}")
+        logger.error("Error publishing document %s: %s", document_id, e)
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -1,7 +1,10 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, ConfigDict
+from typing import Literal, Optional
 from datetime import datetime
 
+# 문서 상태 값 (검증은 pydantic-core의 Literal 매칭으로 처리)
+DocumentStatus = Literal["generated", "edited", "reviewed", "failed"]
+
 # 1.데이터베이스에서 조회하여 클라이언트에게 전송할 문서 응답 스키마
 class DocumentResponse(BaseModel):
     id: int
@@ -15,10 +18,11 @@ class DocumentResponse(BaseModel):
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True 
+    model_config = ConfigDict(from_attributes=True)
+
+DOCUMENT_RESPONSE_FIELDS = tuple(DocumentResponse.model_fields)
 
 class DocumentUpdate(BaseModel):
     title: Optional[str] = None
     content: Optional[str] = None # 편집된 Markdown 내용
-    status: Optional[str] = None # 상태를 'EDITED' 또는 'REVIEW_DONE' 등으로 변경 요청
\ No newline at end of file
+    status: Optional[DocumentStatus] = None # 상태를 'edited' 또는 'reviewed' 등으로 변경 요청
\ No newline at end of file
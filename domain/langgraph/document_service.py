@@ -1,8 +1,15 @@
 from typing import Dict, Any, Optional
 import os
+from functools import lru_cache
 from .document_workflow import DocumentWorkflow
 
 
+@lru_cache(maxsize=4)
+def _get_workflow(api_key: Optional[str], use_mock: bool, model: str) -> DocumentWorkflow:
+    """(api_key, use_mock, model) 조합별로 컴파일된 워크플로우를 한 번만 생성해 재사용"""
+    return DocumentWorkflow(openai_api_key=api_key, use_mock=use_mock, model=model)
+
+
 class DocumentService:
     """문서 자동 생성/업데이트 서비스"""
     
@@ -33,11 +40,13 @@ class DocumentService:
             }
         """
         try:
-            workflow = DocumentWorkflow(
-                openai_api_key=self.openai_api_key,
-                use_mock=self.use_mock
+            # 그래프 컴파일/ChatOpenAI 생성은 요청마다 하지 않고 캐시된 인스턴스 사용
+            workflow = _get_workflow(
+                self.openai_api_key,
+                self.use_mock,
+                os.getenv("DOC_GENERATOR_MODEL", "gpt-5"),
             )
-            result = workflow.process(code_change_id)
+            result = await workflow.aprocess(code_change_id)
             return result
             
         except Exception as e:
@@ -47,8 +56,10 @@ class DocumentService:
             }
 
 
-# 싱글톤 인스턴스
-_service_instance = None
+@lru_cache(maxsize=8)
+def _cached_service(use_mock: bool, openai_api_key: Optional[str]) -> DocumentService:
+    """설정 조합별 서비스 인스턴스 (lru_cache 내부 락으로 스레드 안전)"""
+    return DocumentService(openai_api_key=openai_api_key, use_mock=use_mock)
 
 
 def get_document_service(use_mock: bool = False, openai_api_key: Optional[str] = None) -> DocumentService:
@@ -60,14 +71,6 @@ def get_document_service(use_mock: bool = False, openai_api_key: Optional[str] =
         openai_api_key: OpenAI API 키
         
     Returns:
-        DocumentService 인스턴스
+        DocumentService 인스턴스 (같은 설정이면 같은 인스턴스 재사용)
     """
-    global _service_instance
-    
-    if _service_instance is None or openai_api_key or use_mock:
-        _service_instance = DocumentService(
-            openai_api_key=openai_api_key,
-            use_mock=use_mock
-        )
-    
-    return _service_instance
+    return _cached_service(use_mock, openai_api_key)
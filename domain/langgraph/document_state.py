@@ -1,7 +1,16 @@
-from typing import TypedDict, List, Optional, Dict, Any
+from typing import TypedDict, NamedTuple, List, Optional, Dict, Any, Tuple
 from dataclasses import dataclass
 
 
+
+class SectionUpdate(NamedTuple):
+    """부분 업데이트된 섹션 하나의 메타데이터 (dict 대신 튜플 - 섹션마다 생성되므로 가볍게 유지)"""
+    key: str
+    old_length: int
+    new_length: int
+    changed: bool
+
+
 class DocumentState(TypedDict, total=False):
     """
     LangGraph 워크플로우 상태
@@ -19,8 +28,9 @@ class DocumentState(TypedDict, total=False):
     
     # 로드된 데이터
     code_change: Optional[Dict[str, Any]]  # CodeChange 정보 (commit_sha, message, timestamp )
-    file_changes: Optional[List[Dict[str, Any]]]  # FileChange 목록 (filename, status, patch )
+    file_changes: Optional[List[Dict[str, Any]]]  # FileChange 메타데이터 목록 (filename, status, additions 등 - patch는 diff_content/DB 조회)
     diff_content: Optional[str]  # 통합된 diff 내용
+    diff_spans: Optional[List[Tuple[str, int, int]]]  # 파일별 patch 위치 (filename, start, end) - diff_content 슬라이스용
     changed_files: Optional[List[str]]  # 변경된 파일명 목록
     repository_name: Optional[str]  # 저장소 full_name
     access_token: Optional[str]  # GitHub API 액세스 토큰
@@ -31,6 +41,8 @@ class DocumentState(TypedDict, total=False):
     
     # 분석 결과
     analysis_result: Optional[str]  # LLM 분석 결과 (변경사항 요약)
+    analysis_json: Optional[Dict[str, Any]]  # LLM 분석 결과 (JSON 파싱 성공 시)
+    file_change_summaries: Optional[List[Dict[str, Any]]]  # 파일별 변경 요약 (file, change_type, summary, priority)
     
     # 문서 생성 결정
     should_update: bool  # True: 기존 문서 업데이트, False: 신규 생성
@@ -41,7 +53,7 @@ class DocumentState(TypedDict, total=False):
     document_content: Optional[str]  # 생성/업데이트된 문서 본문 (마크다운)
     document_summary: Optional[str]  # 문서 요약
     # 부분 업데이트 결과 메타데이터
-    updated_sections: Optional[List[Dict[str, Any]]]
+    updated_sections: Optional[List[SectionUpdate]]
     
     # 저장소 전체 분석 결과 (신규 추가)
     repository_path: Optional[str]  # 다운로드된 저장소 경로
@@ -50,6 +62,9 @@ class DocumentState(TypedDict, total=False):
     parsed_files: Optional[List[Dict[str, Any]]]  # Tree-sitter로 파싱된 파일 정보
     file_summaries: Optional[List[Dict[str, Any]]]  # 파일별 요약 결과
     
+    # 워크플로우 단위 DB 세션 (aprocess가 열고 그래프 종료 후 한 번만 commit)
+    db_session: Optional[Any]
+    
     # 저장 결과
     document_id: Optional[int]  # 저장된 Document ID
     action: Optional[str]  # "created" 또는 "updated"
@@ -1,10 +1,14 @@
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional
+import asyncio
 import os
-from functools import partial
+from functools import lru_cache, partial
+
+import httpx
 
 from langchain_openai import ChatOpenAI
 from langgraph.graph import StateGraph, END
 
+from database import SessionLocal
 from .document_state import DocumentState
 from .nodes import (
     data_loader_node,
@@ -18,6 +22,35 @@ from .nodes import (
     full_repository_document_generator_node,
 )
 
+def _to_async(node: Callable[[DocumentState], DocumentState]):
+    """동기 노드를 스레드로 넘겨 실행하는 async 래퍼 (그래프 실행 중 이벤트 루프를 막지 않음)"""
+    async def _run(state: DocumentState) -> DocumentState:
+        return await asyncio.to_thread(node, state)
+    return _run
+
+
+# OpenAI 호출용 공용 httpx 클라이언트: 워크플로우마다 새 커넥션 풀/TLS 핸드셰이크를 만들지 않도록 재사용
+_OPENAI_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+_OPENAI_HTTP_CLIENT = httpx.Client(limits=_OPENAI_HTTP_LIMITS)
+_OPENAI_HTTP_ASYNC_CLIENT = httpx.AsyncClient(limits=_OPENAI_HTTP_LIMITS)
+
+
+@lru_cache(maxsize=4)
+def _get_llm(api_key: str, model: str, temperature: float) -> ChatOpenAI:
+    """(api_key, model, temperature) 조합별 ChatOpenAI 인스턴스를 한 번만 생성"""
+    # ChatOpenAI: 기존 코드 스타일(api_key) 유지, 모델 환경변수화
+    # ChatOpenAI SecretStr 요구를 우회: 래퍼 함수 제공
+    def _key_provider() -> str:
+        return api_key or ""  # None 방지
+    return ChatOpenAI(
+        api_key=_key_provider,
+        model=model,
+        temperature=temperature,
+        http_client=_OPENAI_HTTP_CLIENT,
+        http_async_client=_OPENAI_HTTP_ASYNC_CLIENT,
+    )
+
+
 #LangGraph 워크플로우 메인 클래스
 class DocumentWorkflow:
     """
@@ -31,11 +64,12 @@ class DocumentWorkflow:
         5. document_saver: DB에 저장
     """
     
-    def __init__(self, openai_api_key: Optional[str] = None, use_mock: bool = False):
+    def __init__(self, openai_api_key: Optional[str] = None, use_mock: bool = False, model: Optional[str] = None):
         """
         Args:
             openai_api_key: OpenAI API 키 (없으면 환경변수에서 가져옴)
             use_mock: True면 LLM 대신 Mock 응답 사용 (테스트/개발용)
+            model: 문서/변경 분석용 모델 (없으면 DOC_GENERATOR_MODEL 환경변수)
         """
         self.use_mock = use_mock
         self.api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
@@ -46,16 +80,9 @@ class DocumentWorkflow:
                 raise ValueError("OPENAI_API_KEY is required (or use use_mock=True)")
             
             # 문서/변경 분석용 모델: 환경변수 DOC_GENERATOR_MODEL 사용(기본 gpt-4o)
-            generator_model = os.getenv("DOC_GENERATOR_MODEL", "gpt-5")
-            # ChatOpenAI: 기존 코드 스타일(api_key) 유지, 모델 환경변수화
-            # ChatOpenAI SecretStr 요구를 우회: 래퍼 함수 제공
-            def _key_provider() -> str:
-                return self.api_key or ""  # None 방지
-            self.llm = ChatOpenAI(
-                api_key=_key_provider,
-                model=generator_model,
-                temperature=0.1
-            )
+            generator_model = model or os.getenv("DOC_GENERATOR_MODEL", "gpt-5")
+            # 같은 (키, 모델, temperature)면 ChatOpenAI와 그 커넥션 풀을 공유
+            self.llm = _get_llm(self.api_key, generator_model, 0.1)
         else:
             self.llm = None  # Mock 모드에서는 LLM 사용 안함
         
@@ -67,6 +94,7 @@ class DocumentWorkflow:
         workflow = StateGraph(DocumentState)
         
         # 노드 추가 (각 노드는 독립적인 파일에서 가져옴)
+        # 동기 노드는 _to_async로 감싸 ainvoke 중 이벤트 루프를 막지 않게 함 (data_loader, change_analyzer, document_generator는 async 노드)
         workflow.add_node("data_loader", data_loader_node)
         
 
@@ -75,24 +103,24 @@ class DocumentWorkflow:
             partial(change_analyzer_node, llm=self.llm, use_mock=self.use_mock)
         )
         
-        workflow.add_node("document_decider", document_decider_node)
+        workflow.add_node("document_decider", _to_async(document_decider_node))
         
         #저장소 분석 노드 추가
         workflow.add_node(
             "repository_analyzer",
-            partial(repository_analyzer_node, use_mock=self.use_mock)
+            _to_async(partial(repository_analyzer_node, use_mock=self.use_mock))
         )
         
         # 파일 파싱 노드 추가
         workflow.add_node(
             "file_parser",
-            partial(file_parser_node, use_mock=self.use_mock)
+            _to_async(partial(file_parser_node, use_mock=self.use_mock))
         )
         
         # 파일 요약 노드 추가
         workflow.add_node(
             "file_summarizer",
-            partial(file_summarizer_node, use_mock=self.use_mock, openai_api_key=self.api_key)
+            _to_async(partial(file_summarizer_node, use_mock=self.use_mock, openai_api_key=self.api_key))
         )
         
         # 전체 저장소 분석 시에는 새로운 문서 생성기 사용
@@ -104,10 +132,10 @@ class DocumentWorkflow:
         # 전체 저장소 문서 생성 노드 추가
         workflow.add_node(
             "full_repository_document_generator",
-            partial(full_repository_document_generator_node, use_mock=self.use_mock, openai_api_key=self.api_key)
+            _to_async(partial(full_repository_document_generator_node, use_mock=self.use_mock, openai_api_key=self.api_key))
         )
         
-        workflow.add_node("document_saver", document_saver_node)
+        workflow.add_node("document_saver", _to_async(document_saver_node))
         
 
         
@@ -150,9 +178,9 @@ class DocumentWorkflow:
         
         return workflow.compile()
     
-    def process(self, code_change_id: int) -> Dict[str, Any]:
+    async def aprocess(self, code_change_id: int) -> Dict[str, Any]:
         """
-        워크플로우 실행
+        워크플로우 비동기 실행
         
         Args:
             code_change_id: CodeChange ID
@@ -167,13 +195,22 @@ class DocumentWorkflow:
                 "error": str  # 실패 시
             }
         """
+        # 그래프 실행 전체를 세션(트랜잭션) 하나로 묶고 성공 시 마지막에 한 번만 commit
+        session = SessionLocal()
         initial_state: DocumentState = {
             "code_change_id": code_change_id,
             "status": "loading",
             "should_update": False,
+            "db_session": session,
         }
         
-        result = self.workflow.invoke(initial_state)
+        try:
+            result = await self.workflow.ainvoke(initial_state)
+            if result.get("status") == "completed":
+                await asyncio.to_thread(session.commit)
+        finally:
+            # commit되지 않은 변경은 close 시 롤백
+            await asyncio.to_thread(session.close)
         
         if result.get("status") == "completed":
             return {
@@ -1,9 +1,22 @@
+import atexit
 import json
+import mmap
+import os
+import queue
+import threading
 import time
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Generator, Optional
 
+try:
+    from orjson import dumps as _json_dumps, loads as _json_loads  # C 구현 JSON 직렬화/파서
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(data: dict) -> bytes:
+        return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
 try:
     from langchain.callbacks import get_openai_callback  # 최신 LangChain
 except ImportError:  # 호환성 처리
@@ -19,13 +32,52 @@ LOG_FILE = LOG_DIR / "llm_usage.log"
 LOG_DIR.mkdir(exist_ok=True)
 
 
-def _write_json_line(data: dict) -> None:
-    """사용량 데이터를 JSONL 형태로 파일에 기록"""
+# 사용량 라인은 큐에 넣기만 하고, 백그라운드 스레드가 열어 둔 파일 핸들 하나로 모아서 기록
+_USAGE_BATCH_MAX = 64
+_usage_queue: "queue.SimpleQueue[Optional[bytes]]" = queue.SimpleQueue()
+
+
+def _usage_writer_loop() -> None:
+    """큐에 쌓인 JSONL 라인을 최대 _USAGE_BATCH_MAX개씩 묶어 기록 (None을 받으면 종료)"""
+    # 버퍼드 텍스트 IO 계층 없이 append 모드 fd에 바로 os.write
+    fd = os.open(LOG_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
     try:
-        with LOG_FILE.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(data, ensure_ascii=False) + "\n")
-    except Exception as e:
-        _usage_logger.error(f"Failed to write LLM usage log: {e}")
+        while True:
+            item = _usage_queue.get()
+            batch = []
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= _USAGE_BATCH_MAX:
+                    break
+                try:
+                    item = _usage_queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    os.write(fd, b"".join(batch))
+                except Exception as e:
+                    _usage_logger.error(f"Failed to write LLM usage log: {e}")
+            if item is None:
+                return
+    finally:
+        os.close(fd)
+
+
+_usage_writer = threading.Thread(target=_usage_writer_loop, name="llm-usage-writer", daemon=True)
+_usage_writer.start()
+
+
+@atexit.register
+def _stop_usage_writer() -> None:
+    """종료 시 남은 라인을 모두 기록하고 writer 스레드 정리"""
+    _usage_queue.put(None)
+    _usage_writer.join(timeout=2.0)
+
+
+def _write_json_line(data: dict) -> None:
+    """사용량 데이터를 JSONL 한 줄로 writer 큐에 넣음 (호출 경로에서는 파일 I/O 없음)"""
+    _usage_queue.put(_json_dumps(data) + b"\n")
 
 
 @contextmanager
@@ -68,7 +120,7 @@ def track_llm_usage(operation: str, llm_model: Optional[str] = None) -> Generato
 
 
 def summarize_usage(limit: int = 1000) -> dict:
-    """최근 사용량 로그를 읽어 간단 요약 반환"""
+    """최근 사용량 로그(마지막 limit 줄)를 읽어 간단 요약 반환"""
     if not LOG_FILE.exists():
         return {"total_calls": 0, "total_tokens": 0, "approx_cost_usd": 0.0}
 
@@ -76,17 +128,29 @@ def summarize_usage(limit: int = 1000) -> dict:
     total_tokens = 0
     total_cost = 0.0
     try:
-        with LOG_FILE.open("r", encoding="utf-8") as f:
-            for i, line in enumerate(f):
-                if i >= limit:
-                    break
-                try:
-                    data = json.loads(line)
-                    total_calls += 1
-                    total_tokens += data.get("total_tokens", 0) or 0
-                    total_cost += data.get("total_cost_usd", 0.0) or 0.0
-                except json.JSONDecodeError:
-                    continue
+        # 파일 전체를 mmap으로 보고 마지막 limit 줄만 C 레벨 JSON 파서로 집계
+        with LOG_FILE.open("rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                lines = []
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    # 뒤에서부터 줄바꿈을 찾아 마지막 limit 줄 구간만 복사 (끝의 개행 포함 limit+1개)
+                    start = len(mm)
+                    for _ in range(max(limit, 0) + 1):
+                        start = mm.rfind(b"\n", 0, start)
+                        if start < 0:
+                            break
+                    lines = mm[start + 1:].split(b"\n") if limit > 0 else []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                data = _json_loads(line)
+                total_calls += 1
+                total_tokens += data.get("total_tokens", 0) or 0
+                total_cost += data.get("total_cost_usd", 0.0) or 0.0
+            except ValueError:
+                continue
     except Exception as e:
         _usage_logger.error(f"Failed to summarize LLM usage: {e}")
     return {
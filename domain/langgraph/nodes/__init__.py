@@ -1,22 +1,29 @@
 #LangGraph 워크플로우 노드 모듈
-from .data_loader_node import data_loader_node
-from .change_analyzer_node import change_analyzer_node
-from .document_decider_node import document_decider_node
-from .document_generator_node import document_generator_node
-from .document_saver_node import document_saver_node
-from .repository_analyzer_node import repository_analyzer_node
-from .file_parser_node import file_parser_node
-from .file_summarizer_node import file_summarizer_node
-from .full_repository_document_generator_node import full_repository_document_generator_node
+# 노드 모듈은 처음 접근할 때 import (PEP 562) - tree-sitter/langchain 등 무거운 의존성을 필요한 시점까지 미룸
+import importlib
 
-__all__ = [
-    "data_loader_node",
-    "change_analyzer_node",
-    "document_decider_node",
-    "document_generator_node",
-    "document_saver_node",
-    "repository_analyzer_node",
-    "file_parser_node",
-    "file_summarizer_node",
-    "full_repository_document_generator_node",
-]
+_LAZY_NODES = {
+    "data_loader_node": "data_loader_node",
+    "change_analyzer_node": "change_analyzer_node",
+    "document_decider_node": "document_decider_node",
+    "document_generator_node": "document_generator_node",
+    "document_saver_node": "document_saver_node",
+    "repository_analyzer_node": "repository_analyzer_node",
+    "file_parser_node": "file_parser_node",
+    "file_summarizer_node": "file_summarizer_node",
+    "full_repository_document_generator_node": "full_repository_document_generator_node",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_NODES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{module_name}", __name__)
+    value = getattr(module, name)
+    # 같은 이름의 서브모듈 속성을 노드 함수로 덮어써 이후 접근은 일반 속성 조회로 처리
+    globals()[name] = value
+    return value
+
+
+__all__ = list(_LAZY_NODES)
@@ -1,15 +1,49 @@
-from typing import Optional, Any, cast
+from typing import Optional
+import logging
 import os
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+from functools import lru_cache
+from itertools import islice
 from langchain_openai import ChatOpenAI
+from langchain_openai.chat_models.base import OpenAIRefusalError
+from langchain_core.exceptions import OutputParserException
 from langchain_core.messages import SystemMessage, HumanMessage
-from ..utils.llm_backoff import invoke_with_retry
+from pydantic import BaseModel, ValidationError
+from ..utils.llm_backoff import ainvoke_with_retry
+from app.logging_config import get_logger
 
 from ..document_state import DocumentState
 
+logger = get_logger("langgraph.change_analyzer")
 
-def change_analyzer_node(
+# 프롬프트에 넣을 diff 길이 상한 (lockfile 등 대형 diff로 토큰 비용이 폭증하지 않도록)
+_MAX_DIFF_CHARS = int(os.getenv("CHANGE_ANALYZER_MAX_DIFF_CHARS", "24000"))
+_MAX_FILE_DIFF_CHARS = int(os.getenv("CHANGE_ANALYZER_MAX_FILE_DIFF_CHARS", "1500"))
+
+# diff에서 추가/삭제(+/-) 라인만 골라내는 패턴
+_PLUSMINUS_RE = re.compile(r'(?m)^[+\-][^\n]*')
+
+# 파일 경로 키워드 (호출마다 리스트를 새로 만들지 않도록 모듈 상수로 둠)
+_SECTION_OVERVIEW_KEYWORDS = frozenset(['main', 'app', 'config'])
+_SECTION_ARCHITECTURE_KEYWORDS = frozenset(['router', 'endpoint', 'controller'])
+_SECTION_MODEL_KEYWORDS = frozenset(['model', 'schema', 'entity'])
+_SECTION_SERVICE_KEYWORDS = frozenset(['service', 'handler'])
+
+_HIGH_PRIORITY_KEYWORDS = frozenset([
+    'router', 'endpoint', 'controller', 'api',
+    'schema', 'model', 'entity',
+    'service', 'handler', 'manager',
+    'auth', 'security', 'permission',
+    'database', 'migration', 'config',
+])
+_MEDIUM_PRIORITY_KEYWORDS = frozenset([
+    'util', 'helper', 'middleware',
+    'test', 'spec',
+])
+
+
+async def change_analyzer_node(
     state: DocumentState,
     llm: Optional[ChatOpenAI] = None,
     use_mock: bool = False
@@ -28,19 +62,20 @@ def change_analyzer_node(
         changed_files = state.get("changed_files", []) or []
         code_change = state.get("code_change") or {}
         commit_message = code_change.get("commit_message", "") if isinstance(code_change, dict) else ""
-        print(f"[ChangeAnalyzer] START | files={len(changed_files)} diff_len={len(diff_content)} mock={use_mock}")
-        if changed_files:
+        logger.debug("START | files=%d diff_len=%d mock=%s", len(changed_files), len(diff_content), use_mock)
+        if changed_files and logger.isEnabledFor(logging.DEBUG):
             preview = ', '.join(changed_files[:6]) + (' ...' if len(changed_files) > 6 else '')
-            print(f"[ChangeAnalyzer] Changed files: {preview}")
+            logger.debug("Changed files: %s", preview)
         
         # [수정됨] 파일별 변경사항 요약 생성 (개선된 로직 적용)
-        file_change_summaries = _generate_file_summaries(changed_files, diff_content, use_mock, llm)
-        print(f"[ChangeAnalyzer] Generated file summaries: {len(file_change_summaries)}")
-        s = cast(Any, state)
-        s["file_change_summaries"] = file_change_summaries
+        file_change_summaries = await _generate_file_summaries(
+            changed_files, diff_content, use_mock, llm, state.get("diff_spans")
+        )
+        logger.debug("Generated file summaries: %d", len(file_change_summaries))
+        state["file_change_summaries"] = file_change_summaries
         
         if use_mock:
-            print("[ChangeAnalyzer] PATH=MOCK (LLM bypass)")
+            logger.debug("PATH=MOCK (LLM bypass)")
             # Mock 응답 + 타겟 섹션 추론
             line_adds = diff_content.count('+') if diff_content else 0
             analysis = (
@@ -60,7 +95,7 @@ def change_analyzer_node(
         # 실제 LLM 분석 (종합 분석)
         if llm is None:
             raise ValueError("LLM is required for non-mock mode")
-        print("[ChangeAnalyzer] PATH=REAL LLM")
+        logger.debug("PATH=REAL LLM")
         
         system_prompt = (
             "당신은 코드 변경사항을 분석하여 '문서 업데이트가 필요한 섹션'을 식별하는 전문가입니다.\n"
@@ -78,13 +113,21 @@ def change_analyzer_node(
             "- 불필요한 추측은 피하고 diff 기반으로 판단.\n"
         )
 
+        if len(diff_content) > _MAX_DIFF_CHARS:
+            diff_for_prompt = (
+                diff_content[:_MAX_DIFF_CHARS]
+                + f"\n...[truncated {len(diff_content) - _MAX_DIFF_CHARS} chars]"
+            )
+        else:
+            diff_for_prompt = diff_content
+
         user_prompt = f"""커밋 메시지: {commit_message}
 
 변경된 파일들:
 {', '.join(changed_files)}
 
 Git Diff:
-{diff_content}
+{diff_for_prompt}
 
 위 코드 변경사항을 분석하여 요약해주세요."""
 
@@ -94,86 +137,74 @@ Git Diff:
         ]
         
         # 레이트리밋 대비 재시도 래퍼 사용
-        print("[ChangeAnalyzer] Invoking LLM for aggregate analysis ...")
-        response = invoke_with_retry(llm, messages)
-
-        raw_content = getattr(response, 'content', response)
-        if isinstance(raw_content, list):
-            analysis_text = "\n".join(str(c) for c in raw_content)
-        else:
-            analysis_text = str(raw_content)
-
-        # JSON 파싱 시도
-        import json
-        analysis_json = None
+        logger.debug("Invoking LLM for aggregate analysis ...")
+        # 구조화 출력: SDK가 스키마대로 파싱해 주므로 JSON/정규식 재파싱 불필요
         try:
-            analysis_json = json.loads(analysis_text)
-            print("[ChangeAnalyzer] JSON parse: SUCCESS")
-        except Exception as parse_err:
-            analysis_json = None
-            print(f"[ChangeAnalyzer] JSON parse: FAIL | {str(parse_err)[:100]}")
+            analysis = await ainvoke_with_retry(llm.with_structured_output(ChangeAnalysis), messages)
+        except (OutputParserException, ValidationError, OpenAIRefusalError) as parse_err:
+            # 형식이 어긋나거나 거부된 응답 하나로 워크플로우 전체를 실패시키지 않고 빈 분석으로 진행
+            logger.warning("Structured output: FAIL → empty analysis | %.100s", parse_err)
+            analysis = None
 
         # 상태 저장
-        if analysis_json:
-            s_any = cast(Any, state)
-            s_any["analysis_json"] = analysis_json
-            sections = analysis_json.get("section_targets") if isinstance(analysis_json, dict) else None
-            if isinstance(sections, list):
-                allowed = {"overview", "architecture", "modules", "changelog"}
-                targets = [str(x).strip().lower() for x in sections if str(x).strip().lower() in allowed]
-                state["target_doc_sections"] = targets
-                print(f"[ChangeAnalyzer] Targets(from JSON): {targets}")
-            
+        if analysis is not None:
+            analysis_json = analysis.model_dump()
+            state["analysis_json"] = analysis_json
+            allowed = {"overview", "architecture", "modules", "changelog"}
+            targets = [t for t in (x.strip().lower() for x in analysis.section_targets) if t in allowed]
+            state["target_doc_sections"] = targets
+            logger.debug("Targets(from structured output): %s", targets)
+
             summary_md = []
             for key in ("summary","reasons","impact","details"):
-                val = analysis_json.get(key)
-                if isinstance(val, list) and val:
-                    summary_md.append(f"## {key}\n- " + "\n- ".join(str(v) for v in val))
+                val = analysis_json[key]
+                if val:
+                    summary_md.append(f"## {key}\n- " + "\n- ".join(val))
             state["analysis_result"] = "\n\n".join(summary_md)
         else:
-            state["analysis_result"] = analysis_text
-            extracted = _extract_section_targets(analysis_text)
-            state["target_doc_sections"] = extracted
-            print(f"[ChangeAnalyzer] Targets(fallback): {extracted}")
+            state["analysis_result"] = ""
+            state["target_doc_sections"] = []
             
         state["status"] = "generating"
-        print("[ChangeAnalyzer] END | status=generating")
+        logger.debug("END | status=generating")
         return state
         
     except Exception as e:
         state["error"] = f"Change analyzer failed: {str(e)}"
         state["status"] = "error"
-        print(f"[ChangeAnalyzer] ERROR | {e}")
+        logger.error("ERROR | %s", e)
         return state
 
 
-def _extract_section_targets(text: str) -> list[str]:
-    """LLM 응답 문자열에서 SECTION_TARGETS 값을 파싱"""
-    m = re.search(r'section_targets:\s*([a-z,\s]+?)(?:\n|$)', text.lower(), re.MULTILINE | re.IGNORECASE)
-    if not m:
-        return []
-    raw = m.group(1).strip()
-    raw = re.sub(r'\s+', ' ', raw)
-    tokens = [x.strip() for x in raw.split(',') if x.strip()]
-    allowed = {"overview", "architecture", "modules", "changelog"}
-    return [t for t in tokens if t in allowed]
+class ChangeAnalysis(BaseModel):
+    """종합 변경 분석 구조화 출력 스키마 (system prompt의 JSON 스키마와 동일, strict 모드를 위해 기본값 없이 모두 필수)"""
+    summary: list[str]
+    reasons: list[str]
+    impact: list[str]
+    details: list[str]
+    section_targets: list[str]
 
 
 def _identify_target_sections(changed_files: list[str]) -> list[str]:
     """파일명 기반 타겟 섹션 추론"""
+    return list(_identify_target_sections_cached(tuple(changed_files)))
+
+
+@lru_cache(maxsize=1024)
+def _identify_target_sections_cached(changed_files: tuple[str, ...]) -> tuple[str, ...]:
     targets = set()
     for f in changed_files:
         lf = f.lower()
-        if any(x in lf for x in ['main','app','config']):
+        if any(x in lf for x in _SECTION_OVERVIEW_KEYWORDS):
             targets.add('overview')
-        if any(x in lf for x in ['router','endpoint','controller']):
+        if any(x in lf for x in _SECTION_ARCHITECTURE_KEYWORDS):
             targets.add('architecture'); targets.add('modules')
-        if any(x in lf for x in ['model','schema','entity']):
+        if any(x in lf for x in _SECTION_MODEL_KEYWORDS):
             targets.add('modules')
-        if any(x in lf for x in ['service','handler']):
+        if any(x in lf for x in _SECTION_SERVICE_KEYWORDS):
             targets.add('modules')
     targets.add('changelog')
-    return list(targets)
+    return tuple(targets)
 
 
 def _detect_change_type(file_diff: str) -> str:
@@ -189,18 +220,13 @@ def _detect_change_type(file_diff: str) -> str:
 
 def _build_prompt(file: str, file_diff: str) -> str:
     """파일 단위 변경 요약 프롬프트"""
-    changed = []
-    for line in file_diff.split("\n"):
-        if line.startswith("+") or line.startswith("-"):
-            changed.append(line)
-        if len(changed) > 120:
-            break
-
-    diff_excerpt = "\n".join(changed[:120])
+    # 전체 라인을 split 하지 않고 +/- 라인만 앞에서부터 120개 추출
+    changed = [m.group(0) for m in islice(_PLUSMINUS_RE.finditer(file_diff), 120)]
+    diff_excerpt = "\n".join(changed)
     return (
         f"다음 파일의 변경사항을 1-2문장으로 요약하세요.\n"
         f"파일: {file}\n\n"
-        f"변경된 핵심 라인:\n{diff_excerpt[:1500]}\n\n"
+        f"변경된 핵심 라인:\n{diff_excerpt[:_MAX_FILE_DIFF_CHARS]}\n\n"
         f"요약:"
     )
 
@@ -218,41 +244,51 @@ def _parse_diff_to_map(diff_content: str) -> dict[str, str]:
         return {}
         
     diff_map = {}
-    # 'diff --git ' 기준으로 나눔. 첫 번째 청크는 보통 비어있거나 헤더.
-    chunks = diff_content.split('diff --git ')
-    
+    # 줄 시작의 'diff --git ' 기준으로 나눔. 첫 번째 청크는 보통 비어있거나 헤더.
+    chunks = diff_content.split('\ndiff --git ')
+    if chunks[0].startswith('diff --git '):
+        chunks[0] = chunks[0][len('diff --git '):]
+
     for chunk in chunks:
-        if not chunk.strip():
-            continue
-            
         # chunk의 첫 줄에서 파일 경로 추출 (a/path/to/file b/path/to/file)
-        # 보통 "a/..." 가 원본 파일 경로
-        lines = chunk.split('\n', 1)
-        header_line = lines[0]
-        
-        # a/경로 추출 시도
-        match = re.search(r'a/(.*?)\s+b/', header_line)
-        if match:
-            file_path = match.group(1).strip()
-            # "diff --git " 접두사를 다시 붙여서 저장
-            diff_map[file_path] = f"diff --git {chunk}"
+        # 보통 "a/..." 가 원본 파일 경로 - 정규식 대신 partition으로 " b/" 앞부분만 취함
+        header_line = chunk.partition('\n')[0]
+        if not header_line.strip():
+            continue
+
+        a_part, sep, _ = header_line.partition(' b/')
+        if sep and a_part.startswith('a/'):
+            file_path = a_part[2:].strip()
         else:
-            # a/ b/ 패턴이 아닐 경우(예: --no-prefix), 파일명만이라도 키로 잡기 위해 단순 처리 가능
-            # 여기서는 안전하게 첫 단어를 키로 사용
+            # a/ b/ 패턴이 아닐 경우(예: --no-prefix), 여기서는 안전하게 첫 단어를 키로 사용
             parts = header_line.split()
-            if len(parts) >= 2:
-                # 대략 a/file 형태라고 가정
-                f = parts[0]
-                if f.startswith("a/"): f = f[2:]
-                diff_map[f] = f"diff --git {chunk}"
+            if len(parts) < 2:
+                continue
+            file_path = parts[0][2:] if parts[0].startswith('a/') else parts[0]
+
+        # "diff --git " 접두사를 다시 붙여서 저장
+        diff_map[file_path] = f"diff --git {chunk}"
 
     return diff_map
 
 
-def _find_diff_for_file(filename: str, diff_map: dict[str, str]) -> str:
+def _build_basename_index(diff_map: dict[str, str]) -> dict[str, list[str]]:
+    """diff_map 키를 파일명(basename) 기준으로 묶은 역색인 (Suffix 매칭 후보를 O(1)로 좁힘)"""
+    index: dict[str, list[str]] = {}
+    for key in diff_map:
+        index.setdefault(os.path.basename(key), []).append(key)
+    return index
+
+
+def _find_diff_for_file(
+    filename: str,
+    diff_map: dict[str, str],
+    by_basename: Optional[dict[str, list[str]]] = None
+) -> str:
     """
     changed_files의 filename과 diff_map의 키(a/경로)를 매칭.
     경로 불일치(예: src/main.py vs a/backend/src/main.py)를 해결하기 위해 Suffix 매칭 사용.
+    by_basename 역색인이 주어지면 같은 파일명을 가진 키만 먼저 검사한다.
     """
     # 1. 완전 일치 (Best)
     if filename in diff_map:
@@ -265,6 +301,15 @@ def _find_diff_for_file(filename: str, diff_map: dict[str, str]) -> str:
     # 3. Suffix 매칭 (Flexible)
     # filename이 "main.py"이고 map key가 "backend/main.py"인 경우 등
     norm_name = filename.strip().replace('\\', '/')
+    if norm_name in diff_map:
+        return diff_map[norm_name]
+
+    if by_basename is not None:
+        for key in by_basename.get(os.path.basename(norm_name), ()):
+            if key.endswith(norm_name) or norm_name.endswith(key):
+                return diff_map[key]
+
+    # 역색인으로 못 찾은 경우(파일명 중간이 잘린 경로 등)에만 전체 스캔
     for key, content in diff_map.items():
         # diff map의 키는 보통 전체 경로.
         # 입력된 filename이 diff map 키의 뒷부분과 일치하면 매칭으로 간주
@@ -274,11 +319,12 @@ def _find_diff_for_file(filename: str, diff_map: dict[str, str]) -> str:
     return ""
 
 
-def _generate_file_summaries(
+async def _generate_file_summaries(
     changed_files: list[str],
     diff_content: str,
     use_mock: bool,
-    llm: Optional[ChatOpenAI]
+    llm: Optional[ChatOpenAI],
+    diff_spans: Optional[list] = None
 ) -> list[dict]:
     """파일별 변경사항 요약 생성 (Diff 파싱 방식 개선)."""
 
@@ -286,113 +332,113 @@ def _generate_file_summaries(
     
     # [Fix] Diff를 미리 파싱하여 Map으로 변환
     diff_map = _parse_diff_to_map(diff_content)
+    if not diff_map and diff_spans:
+        # data_loader 형식('### 파일 (상태)')에는 'diff --git' 헤더가 없으므로 기록된 patch 위치로 바로 슬라이스
+        diff_map = {name: diff_content[start:end] for name, start, end in diff_spans}
+
+    # 파일별 (우선순위, diff, 변경 타입)을 한 번만 계산해 모든 분기에서 재사용
+    # diff_map이 비어 있으면 매칭 시도 자체를 생략
+    if diff_map:
+        by_basename = _build_basename_index(diff_map)
+        file_diffs = [_find_diff_for_file(f, diff_map, by_basename) for f in changed_files]
+    else:
+        file_diffs = [""] * len(changed_files)
+    file_infos = [
+        (f, _get_file_priority(f), file_diff, _detect_change_type(file_diff))
+        for f, file_diff in zip(changed_files, file_diffs)
+    ]
 
     # 1) Mock 모드
     if use_mock:
-        for file in changed_files:
-            file_diff = _find_diff_for_file(file, diff_map)
-            change_type = _detect_change_type(file_diff)
+        for file, priority, _, change_type in file_infos:
             summaries.append({
                 "file": file,
                 "change_type": change_type,
                 "summary": f"{file} 파일이 {change_type}되었습니다.",
-                "priority": _get_file_priority(file)
+                "priority": priority
             })
         return summaries
 
     # 2) LLM 없음 (Fallback)
     if llm is None:
-        for f in changed_files:
-            file_diff = _find_diff_for_file(f, diff_map)
+        for f, priority, _, change_type in file_infos:
             summaries.append({
                 "file": f,
-                "change_type": _detect_change_type(file_diff),
+                "change_type": change_type,
                 "summary": f"{f} 파일 변경",
-                "priority": _get_file_priority(f)
+                "priority": priority
             })
         return summaries
 
-    # 3) 우선순위 분류
-    high_medium = []
-    for f in changed_files:
-        p = _get_file_priority(f)
+    # 3) 우선순위 분류 + Diff가 없는 파일은 분석 불가 -> Fallback, 나머지는 프롬프트 구성
+    # 결과는 입력 위치(idx)에 바로 기록해 마지막에 순서를 다시 맞출 필요가 없게 함
+    slots: list[Optional[dict]] = [None] * len(file_infos)
+    targets = []
+    prompts = []
+    for idx, (f, p, file_diff, change_type) in enumerate(file_infos):
         if p == "low":
-            file_diff = _find_diff_for_file(f, diff_map)
-            change_type = _detect_change_type(file_diff)
-            summaries.append({
+            slots[idx] = {
                 "file": f,
                 "change_type": change_type,
                 "summary": f"{f} ({change_type})",
                 "priority": p
-            })
+            }
+        elif not file_diff:
+            slots[idx] = {
+                "file": f,
+                "change_type": change_type,
+                "summary": f"{f} 변경 (Diff 상세 없음)",
+                "priority": p
+            }
         else:
-            high_medium.append((f, p))
-
-    max_workers = int(os.getenv("FILE_SUMMARY_MAX_CONCURRENCY", "4"))
-    max_workers = max(1, max_workers)
+            targets.append((idx, f, p, change_type))
+            prompts.append([HumanMessage(content=_build_prompt(f, file_diff))])
 
-    # 4) LLM 처리 함수 (내부 함수에서 diff_map 참조)
-    def _summarize(file: str, priority: str) -> dict:
-        import time
-        import threading
-        thread_id = threading.current_thread().name
+    # 4) 스레드 풀 대신 abatch로 한 이벤트 루프에서 동시 요청 (실패한 항목만 Fallback)
+    if prompts:
+        max_concurrency = max(1, int(os.getenv("FILE_SUMMARY_MAX_CONCURRENCY", "8")))
         start = time.time()
-        
-        # [Fix] 맵에서 Diff 검색
-        file_diff = _find_diff_for_file(file, diff_map)
-        change_type = _detect_change_type(file_diff)
-
-        # Diff가 정말 없으면 분석 불가 -> Fallback
-        if not file_diff:
-            # 디버깅용: 실제로는 로그를 남기는 것이 좋음
-            # print(f"[{thread_id}] Warn: No diff found for {file}")
-            return {
+        if len(prompts) == 1:
+            # 단일 파일이면 배치 디스패치(executor 설정 등)를 거치지 않고 바로 호출
+            try:
+                results = [await ainvoke_with_retry(llm, prompts[0])]
+            except Exception as e:
+                results = [e]
+        else:
+            results = await llm.abatch(
+                prompts,
+                config={"max_concurrency": max_concurrency},
+                return_exceptions=True,
+            )
+            # 실패한 항목만 백오프 재시도 (rate limit 등 일시적 오류 복구, 재시도 후에도 실패하면 Fallback)
+            for i, resp in enumerate(results):
+                if isinstance(resp, Exception):
+                    try:
+                        results[i] = await ainvoke_with_retry(llm, prompts[i])
+                    except Exception as e:
+                        results[i] = e
+        for (idx, file, priority, change_type), resp in zip(targets, results):
+            if isinstance(resp, Exception):
+                text = f"{file} 파일 {change_type} (분석 실패)"
+            else:
+                text = str(getattr(resp, "content", resp))
+            slots[idx] = {
                 "file": file,
                 "change_type": change_type,
-                "summary": f"{file} 변경 (Diff 상세 없음)",
+                "summary": text,
                 "priority": priority
             }
+        logger.debug("File summaries 완료: %d files (%.2fs)", len(prompts), time.time() - start)
 
-        prompt = _build_prompt(file, file_diff)
-        text = ""
-        try:
-            resp = invoke_with_retry(llm, [HumanMessage(content=prompt)])
-            text = str(getattr(resp, "content", resp))
-        except Exception as e:
-            text = f"{file} 파일 {change_type} (분석 실패)"
-
-        print(f"  [{thread_id}] 완료: {file} ({time.time()-start:.2f}s)")
-        return {
-            "file": file,
-            "change_type": change_type,
-            "summary": text,
-            "priority": priority
-        }
-
-    # 5) 병렬 실행
-    if high_medium:
-        workers = min(max_workers, len(high_medium))
-        with ThreadPoolExecutor(max_workers=workers) as ex:
-            futures = {ex.submit(_summarize, f, p): (f, p) for f, p in high_medium}
-            for fut in as_completed(futures):
-                summaries.append(fut.result())
-
-    # 6) 순서 복원
-    order_map = {s["file"]: s for s in summaries}
-    return [order_map[f] for f in changed_files if f in order_map]
+    return [s for s in slots if s is not None]
 
 
+@lru_cache(maxsize=4096)
 def _get_file_priority(filepath: str) -> str:
-    """파일 우선순위 판단"""
+    """파일 우선순위 판단 (경로별로 한 번만 계산)"""
     lower = filepath.lower()
     
-    if any(x in lower for x in ['router', 'endpoint', 'controller', 'api']): return "high"
-    if any(x in lower for x in ['schema', 'model', 'entity']): return "high"
-    if any(x in lower for x in ['service', 'handler', 'manager']): return "high"
-    if any(x in lower for x in ['auth', 'security', 'permission']): return "high"
-    if any(x in lower for x in ['database', 'migration', 'config']): return "high"
-    
-    if any(x in lower for x in ['util', 'helper', 'middleware']): return "medium"
-    if any(x in lower for x in ['test', 'spec']): return "medium"
+    if any(x in lower for x in _HIGH_PRIORITY_KEYWORDS): return "high"
+    if any(x in lower for x in _MEDIUM_PRIORITY_KEYWORDS): return "medium"
     
     return "low"
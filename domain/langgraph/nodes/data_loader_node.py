@@ -1,33 +1,98 @@
+import asyncio
+import io
 from typing import TYPE_CHECKING
 from ..document_state import DocumentState
-from database import SessionLocal
-from models import CodeChange, FileChange, Document
+from database import AsyncSessionLocal
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import CodeChange, Document, FileChange, Repository
 
+# FileChange 스트리밍 시 한 번에 가져올 행 수
+FILE_CHANGE_CHUNK_SIZE = 50
 
-def _get_repository_access_token_sync(full_name: str) -> str:
-    """저장소의 액세스 토큰 가져오기 (동기 버전)"""
+
+async def _get_repository_access_token(full_name: str) -> str:
+    """저장소의 액세스 토큰 가져오기 (다른 조회와 동시에 실행되도록 별도 세션 사용)"""
     from models import WebhookRegistration
     
-    session = SessionLocal()
     try:
         # 저장소의 웹훅 등록 정보에서 토큰 가져오기
         repo_owner, repo_name = full_name.split("/") if "/" in full_name else (full_name, "")
-        webhook_reg = session.query(WebhookRegistration).filter(
-            WebhookRegistration.repo_owner == repo_owner,
-            WebhookRegistration.repo_name == repo_name,
-            WebhookRegistration.is_active == True
-        ).first()
+        async with AsyncSessionLocal() as session:
+            access_token = (await session.execute(
+                select(WebhookRegistration.access_token).where(
+                    WebhookRegistration.repo_owner == repo_owner,
+                    WebhookRegistration.repo_name == repo_name,
+                    WebhookRegistration.is_active == True
+                ).limit(1)
+            )).scalar_one_or_none()
 
-        if webhook_reg is not None and webhook_reg.access_token is not None:
-            return str(webhook_reg.access_token)
+        if access_token is not None:
+            return str(access_token)
         else:
             print(f"No access token found for repository {full_name}")
             return ""
     except Exception as e:
         print(f"Failed to get access token for {full_name}: {e}")
         return ""
-    finally:
-        session.close()
+
+
+async def _load_existing_document(repository_name: str):
+    """기존 문서 조회 (같은 저장소의 최신 문서, 별도 세션) - 큰 content 본문은 여기서 읽지 않음
+    (LLM 업데이트 경로에서만 document_generator가 id로 다시 조회)"""
+    async with AsyncSessionLocal() as session:
+        return (await session.execute(
+            select(Document.id, Document.title, Document.summary).where(
+                Document.repository_name == repository_name,
+                Document.status.in_(["generated", "edited", "reviewed"])
+            ).order_by(Document.updated_at.desc(), Document.id.desc()).limit(1)
+        )).first()
+
+
+async def _load_file_changes(session: AsyncSession, code_change_id: int) -> tuple[str, list, list, list]:
+    """FileChange 로드 -> (diff_content, diff_spans, changed_files, file_changes 메타데이터)"""
+    # diff 통합 - 파일별 문자열 리스트 없이 버퍼에 바로 기록 (파일 목록/상세도 같은 루프에서 구성)
+    # 파일별 patch의 (시작, 끝) 위치도 함께 기록해 하위 노드가 전체 diff를 다시 파싱하지 않고 슬라이스만 하도록 함
+    diff_buf = io.StringIO()
+    pos = 0
+    diff_spans = []
+    changed_files = []
+    file_change_dicts = []
+    # FileChange는 yield_per 단위로 스트리밍해 전체 행(patch 포함)을 한꺼번에 들고 있지 않음
+    # state에는 메타데이터만 싣고, patch 원문이 필요한 노드는 code_change_id로 다시 조회
+    file_change_rows = await session.stream(
+        select(
+            FileChange.filename,
+            FileChange.status,
+            FileChange.changes,
+            FileChange.additions,
+            FileChange.deletions,
+            FileChange.patch,
+        ).where(
+            FileChange.code_change_id == code_change_id
+        ).order_by(FileChange.id).execution_options(yield_per=FILE_CHANGE_CHUNK_SIZE)
+    )
+    async for fc in file_change_rows:
+        if changed_files:
+            pos += diff_buf.write("\n")
+        changed_files.append(fc.filename)
+        file_change_dicts.append({
+            "filename": fc.filename,
+            "status": fc.status,
+            "changes": fc.changes,
+            "additions": fc.additions,
+            "deletions": fc.deletions,
+        })
+        pos += diff_buf.write(f"\n### {fc.filename} ({fc.status})\n+{fc.additions} -{fc.deletions}\n\n")
+        if fc.patch:
+            start = pos
+            pos += diff_buf.write(fc.patch)
+            diff_spans.append((fc.filename, start, pos))
+        else:
+            pos += diff_buf.write("(no patch)")
+        pos += diff_buf.write("\n")
+    
+    return diff_buf.getvalue(), diff_spans, changed_files, file_change_dicts
 
 
 if TYPE_CHECKING:
@@ -35,7 +100,7 @@ if TYPE_CHECKING:
 
 #DB에서 CodeChange, FileChange, 기존 Document를 로드하는 노드
 
-def data_loader_node(state: DocumentState) -> DocumentState:
+async def data_loader_node(state: DocumentState) -> DocumentState:
     """
     데이터 로더 노드
     
@@ -51,8 +116,9 @@ def data_loader_node(state: DocumentState) -> DocumentState:
     
     출력:
         - code_change: 커밋 정보 딕셔너리
-        - file_changes: FileChange 목록
+        - file_changes: FileChange 메타데이터 목록 (patch 제외)
         - diff_content: 통합된 diff 내용
+        - diff_spans: 파일별 patch 위치 (filename, start, end)
         - changed_files: 변경된 파일명 목록
         - repository_name: 저장소 이름
         - existing_document: 기존 문서 (있으면)
@@ -64,50 +130,40 @@ def data_loader_node(state: DocumentState) -> DocumentState:
             state["error"] = "code_change_id is required"
             state["status"] = "error"
             return state
-        session = SessionLocal()
-        
-        try:
-            # CodeChange 조회
-            code_change = session.query(CodeChange).filter(
-                CodeChange.id == code_change_id
-            ).first()
+        # AsyncSession: DB 대기 중 이벤트 루프를 양보해 다른 워크플로우 실행과 겹칠 수 있게 함
+        async with AsyncSessionLocal() as session:
+            # 읽고 dict로 옮기기만 하므로 ORM 객체(identity map/속성 계측) 대신 필요한 컬럼만 Row로 조회
+            # CodeChange 조회 - 저장소 이름은 OUTER JOIN으로 함께 (FileChange는 아래에서 스트리밍)
+            code_change = (await session.execute(
+                select(
+                    CodeChange.id,
+                    CodeChange.commit_sha,
+                    CodeChange.commit_message,
+                    CodeChange.author_name,
+                    CodeChange.timestamp,
+                    Repository.full_name,
+                ).outerjoin(
+                    Repository, CodeChange.repository_id == Repository.id
+                ).where(
+                    CodeChange.id == code_change_id
+                )
+            )).first()
             
-            if not code_change:
+            if code_change is None:
                 state["error"] = f"CodeChange not found: {code_change_id}"
                 state["status"] = "error"
                 return state
             
-            # FileChange 조회
-            file_changes = session.query(FileChange).filter(
-                FileChange.code_change_id == code_change_id
-            ).all()
-            
             # Repository 정보
-            repository_name = "unknown"
-            if code_change.repository:
-                repository_name = code_change.repository.full_name
+            repository_name = code_change.full_name or "unknown"
             
-            # 기존 문서 조회 (같은 저장소의 최신 문서)
-            existing_doc = session.query(Document).filter(
-                Document.repository_name == repository_name,
-                Document.status.in_(["generated", "edited", "reviewed"])
-            ).order_by(Document.updated_at.desc()).first()
-            
-            # diff 통합
-            diff_parts = []
-            changed_files = []
-            for fc in file_changes:
-                changed_files.append(fc.filename)
-                diff_parts.append(
-                    f"\n### {fc.filename} ({fc.status})\n"
-                    f"+{fc.additions} -{fc.deletions}\n\n"
-                    f"{fc.patch or '(no patch)'}\n"
-                )
-            
-            diff_content = "\n".join(diff_parts)
-            
-            # Access token 추출 (저장소 분석에 필요)
-            access_token = _get_repository_access_token_sync(repository_name)
+            # 기존 문서 / FileChange / 액세스 토큰은 서로 독립이라 동시에 조회
+            # (AsyncSession 하나는 동시 쿼리를 허용하지 않으므로 문서/토큰 조회는 각자 세션을 사용)
+            (diff_content, diff_spans, changed_files, file_change_dicts), existing_doc, access_token = await asyncio.gather(
+                _load_file_changes(session, code_change_id),
+                _load_existing_document(repository_name),
+                _get_repository_access_token(repository_name),
+            )
             
             # State 업데이트
             state["code_change"] = {
@@ -118,26 +174,16 @@ def data_loader_node(state: DocumentState) -> DocumentState:
                 "timestamp": code_change.timestamp.isoformat() if code_change.timestamp is not None else None,
             }
             state["access_token"] = access_token
-            state["file_changes"] = [
-                {
-                    "filename": fc.filename,
-                    "status": fc.status,
-                    "changes": fc.changes,
-                    "additions": fc.additions,
-                    "deletions": fc.deletions,
-                    "patch": fc.patch,
-                }
-                for fc in file_changes
-            ]
+            state["file_changes"] = file_change_dicts
             state["diff_content"] = diff_content
+            state["diff_spans"] = diff_spans
             state["changed_files"] = changed_files
             state["repository_name"] = repository_name
             
-            if existing_doc:
+            if existing_doc is not None:
                 state["existing_document"] = {
                     "id": existing_doc.id,
                     "title": existing_doc.title,
-                    "content": existing_doc.content,
                     "summary": existing_doc.summary,
                 }
             else:
@@ -146,9 +192,6 @@ def data_loader_node(state: DocumentState) -> DocumentState:
             state["status"] = "analyzing"
             return state
             
-        finally:
-            session.close()
-            
     except Exception as e:
         state["error"] = f"Data loader failed: {str(e)}"
         state["status"] = "error"
@@ -41,12 +41,15 @@ def document_decider_node(state: DocumentState) -> DocumentState:
             state["should_update"] = True
             state["document_title"] = existing_doc["title"]  # 기존 제목 유지
             state["needs_full_analysis"] = False
+            # 이후 노드는 id/title만 사용 - 본문은 부분 업데이트 경로에서만 id로 다시 조회하므로 state에 싣지 않음
+            state["existing_document"] = {"id": existing_doc.get("id"), "title": existing_doc["title"]}
             
             print(f"[DocumentDecider] Updating existing document: {existing_doc['title']}")
         else:
             # 신규 문서 생성 (전체 저장소 분석 필요)
             state["should_update"] = False
             state["needs_full_analysis"] = True
+            state["existing_document"] = None
             
             # 전체 저장소 문서 제목 생성
             state["document_title"] = f"{repo_name} - Project Documentation"
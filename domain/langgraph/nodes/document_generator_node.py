@@ -1,18 +1,29 @@
 from typing import Optional, Dict, List, Any
+import hashlib
+import logging
 import os
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from dataclasses import dataclass
+import orjson
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
-from ..utils.llm_backoff import invoke_with_retry
+from sqlalchemy import select
+from ..utils.llm_backoff import ainvoke_with_retry
 
-from ..document_state import DocumentState
+from app.logging_config import get_logger
+from database import AsyncSessionLocal
+from models import Document
+from ..document_state import DocumentState, SectionUpdate
 
 #LLM 또는 Mock을 사용하여 마크다운 문서를 생성/업데이트하는 노드 (섹션 단위 부분 업데이트 포함)
 
+logger = get_logger("langgraph.document_generator")
 
-def document_generator_node(
+
+async def document_generator_node(
     state: DocumentState,
     llm: Optional[ChatOpenAI] = None,
     use_mock: bool = False
@@ -48,8 +59,7 @@ def document_generator_node(
         should_update = state.get("should_update", False)
         analysis_result = state.get("analysis_result", "")
         
-        print(f"[DocumentGenerator] should_update: {should_update}")
-        print(f"[DocumentGenerator] analysis_result length: {len(analysis_result) if analysis_result else 0}")
+        logger.debug("should_update=%s analysis_len=%d", should_update, len(analysis_result) if analysis_result else 0)
         
         # Mock 모드 처리
         if use_mock:
@@ -86,13 +96,13 @@ Mock 모드로 생성된 문서입니다.
             # 섹션 단위 부분 업데이트 체크
             target_sections = state.get("target_doc_sections")
             if target_sections:
-                print(f"[DocumentGenerator] Partial update mode: {len(target_sections)} sections")
-                return _handle_partial_update(state, llm, use_mock)
+                logger.debug("Partial update mode: %d sections", len(target_sections))
+                return await _handle_partial_update(state, llm, use_mock)
             
             # 전체 문서 업데이트
-            print("[DocumentGenerator] Full document update mode")
+            logger.debug("Full document update mode")
             existing_doc = state.get("existing_document") or {}
-            existing_content = existing_doc.get("content", "") if isinstance(existing_doc, dict) else ""
+            existing_content = await _load_existing_content(existing_doc) if isinstance(existing_doc, dict) else ""
             system_prompt = (
                 "당신은 기술 문서 편집 전문가입니다. 전체 재생성 대신 전체 문서 맨 아래에 '## Changelog' 섹션을 만들거나 갱신하고 이번 변경사항을 추가하세요.\n"
                 "기존 본문은 수정하지 말고 변경 필요 문맥만 최소화하여 반영." )
@@ -116,7 +126,7 @@ Mock 모드로 생성된 문서입니다.
             HumanMessage(content=user_prompt)
         ]
         
-        response = invoke_with_retry(llm, messages)
+        response = await ainvoke_with_retry(llm, messages)
         
         content_value = response.content
         if not isinstance(content_value, str):
@@ -137,7 +147,7 @@ Mock 모드로 생성된 문서입니다.
 
 요약:"""
         
-        summary_response = invoke_with_retry(llm, [HumanMessage(content=summary_prompt)])
+        summary_response = await ainvoke_with_retry(llm, [HumanMessage(content=summary_prompt)])
         summary_value = summary_response.content
         if not isinstance(summary_value, str):
             try:
@@ -167,35 +177,84 @@ SECTION_KEY_MAP = {
     'changelog': ['changelog','change log','recent changes'],
 }
 
-@dataclass
+# 부분 업데이트 설정 (호출마다 환경변수를 다시 읽지 않도록 import 시 1회 로드, 변경 시 _reload_env() 호출)
+_PARTIAL_UPDATE_ENABLED = False
+_MAX_SECTION_CHARS = 6000
+_MAX_WORKERS = 3
+_OPENAI_KEY = ''
+_SECTION_CACHE_SIZE = 256
+
+def _reload_env() -> None:
+    """부분 업데이트 관련 환경변수 다시 읽기"""
+    global _PARTIAL_UPDATE_ENABLED, _MAX_SECTION_CHARS, _MAX_WORKERS, _OPENAI_KEY, _SECTION_CACHE_SIZE
+    _PARTIAL_UPDATE_ENABLED = os.getenv("PARTIAL_DOC_UPDATE", "false").lower() in {"1","true","yes"}
+    _MAX_SECTION_CHARS = int(os.getenv('PARTIAL_DOC_UPDATE_MAX_SECTION_CHARS', '6000'))
+    _MAX_WORKERS = max(1, int(os.getenv('PARTIAL_UPDATE_MAX_CONCURRENCY', '3')))
+    _OPENAI_KEY = os.getenv('OPENAI_API_KEY') or ''
+    _SECTION_CACHE_SIZE = int(os.getenv('SECTION_UPDATE_CACHE_SIZE', '256'))
+
+_reload_env()
+
+# 섹션 파싱/병합에 쓰는 정규식 (호출마다 컴파일/캐시 조회하지 않도록 모듈 로드 시 1회 컴파일)
+_H2_RE = re.compile(r'^##\s+(.+)$', re.MULTILINE)
+_UPDATE_RE = re.compile(r'\[UPDATE:\s*([^\]]+)\]\s*\n*([^\[]*?)(?=\[|$)', re.DOTALL)
+_UPDATE_MARKER_RE = re.compile(r'\[UPDATE:[^\]]*\]')
+_ADD_RE = re.compile(r'\[ADD\]\s*\n*([^\[]*?)(?=\[|$)', re.DOTALL)
+_NORMALIZE_RE = re.compile(r'[^a-z0-9]+')
+
+@dataclass(slots=True, frozen=True)
 class ParsedDocument:
     sections: Dict[str, str]
     order: List[str]
     headings: Dict[str, str]
 
+@lru_cache(maxsize=256)
 def _normalize_section_key(heading: str) -> str:
     """섹션 제목을 정규화된 키로 변환"""
     lower = heading.lower()
     for key, variants in SECTION_KEY_MAP.items():
         if any(v in lower for v in variants):
             return key
-    return re.sub(r'[^a-z0-9]+','_', lower).strip('_')[:40]
+    return _NORMALIZE_RE.sub('_', lower).strip('_')[:40]
+
+def _find_h2(content: str, pos: int) -> Optional[tuple[int, int, str]]:
+    """pos 이후 첫 '## 제목' 줄 찾기 -> (줄 시작, 제목 줄 끝, 제목) (_H2_RE와 같은 규칙, 없으면 None)"""
+    n = len(content)
+    i = pos
+    while True:
+        if not (content.startswith('##', i) and (i == 0 or content[i - 1] == '\n')):
+            nl = content.find('\n##', i)
+            if nl < 0:
+                return None
+            i = nl + 1
+        j = i + 2
+        if j < n and content[j].isspace():
+            e = content.find('\n', j)
+            if e < 0:
+                e = n
+            heading = content[j:e].strip()
+            if content[j] != '\n' and heading:
+                return i, e, heading
+            # 제목 줄이 공백뿐인 드문 경우는 정규식 매칭 결과를 그대로 따름
+            m = _H2_RE.match(content, i)
+            if m:
+                return i, m.end(), m.group(1).strip()
+        i += 1
 
 def _parse_markdown_sections(content: str) -> ParsedDocument:
-    """마크다운을 섹션별로 파싱 (## 기준)"""
-    pattern = re.compile(r'^##\s+(.+)$', re.MULTILINE)
-    matches = list(pattern.finditer(content))
-    if not matches:
+    """마크다운을 섹션별로 파싱 (## 기준, 매치 목록 없이 앞에서부터 한 번만 훑음)"""
+    current = _find_h2(content, 0)
+    if current is None:
         return ParsedDocument(sections={'__full__': content}, order=['__full__'], headings={'__full__': 'Document'})
     
     sections: Dict[str, str] = {}
     order: List[str] = []
     headings: Dict[str, str] = {}
     
-    for idx, m in enumerate(matches):
-        heading = m.group(1).strip()
-        start = m.end()
-        end = matches[idx + 1].start() if idx + 1 < len(matches) else len(content)
+    while current is not None:
+        _, start, heading = current
+        nxt = _find_h2(content, start)
+        end = nxt[0] if nxt is not None else len(content)
         body = content[start:end].strip()
         key = _normalize_section_key(heading)
         
@@ -209,6 +268,7 @@ def _parse_markdown_sections(content: str) -> ParsedDocument:
         sections[unique_key] = body
         order.append(unique_key)
         headings[unique_key] = heading
+        current = nxt
     
     return ParsedDocument(sections=sections, order=order, headings=headings)
 
@@ -221,6 +281,39 @@ def _merge_sections(parsed: ParsedDocument, updated: Dict[str, str]) -> str:
         lines.append(f"## {original_heading}\n{body.strip()}\n")
     return "\n".join(lines).strip()
 
+# 섹션 업데이트 system 프롬프트는 섹션과 무관한 고정 문자열로 유지 (섹션별 내용은 user 메시지로)
+# -> 요청마다 같은 접두어가 되어 OpenAI 프롬프트 캐싱(동일 prefix 재사용)이 적용될 수 있음
+_CHANGELOG_SYSTEM_PROMPT = (
+    "당신의 역할은 changelog 작성자입니다.\n"
+    "이번 커밋에서 새로 발생한 변화만을 요약하여 '신규 changelog 항목'만 생성하세요.\n\n"
+    "규칙:\n"
+    "- 기존 changelog 내용은 다시 언급하지 않습니다.\n"
+    "- 출력 형식: 새로운 bullet 한 개 또는 1~3줄의 짧은 항목\n"
+    "- 불필요한 설명, 헤더, Markdown 코드블록 금지\n"
+    "- 커밋과 직접 관련된 변경 사항만 포함\n"
+)
+
+_SECTION_SYSTEM_PROMPT = (
+    "당신의 역할은 기술 문서 수정 전문가입니다.\n\n"
+    "주어진 섹션의 기존 내용을 읽고, 실제 변경이 필요한 부분만 찾아 최소 단위로 업데이트하세요.\n"
+    "전체 문서를 다시 쓰는 것이 아니라, '변경된 부분만 정확히 생성'해야 합니다.\n\n"
+    "출력 규칙(매우 중요):\n"
+    "1. 기존 문장이 수정되어야 하는 경우:\n"
+    "   - 수정된 문단만 출력하고\n"
+    "   - 맨 앞에 [UPDATE: 기존문구일부] 형태로 표시합니다.\n\n"
+    "2. 새로운 내용이 추가되어야 하는 경우:\n"
+    "   - 추가 문단만 출력하고\n"
+    "   - 맨 앞에 [ADD] 를 붙입니다.\n\n"
+    "3. 변화가 전혀 필요하지 않다면:\n"
+    "   - 오직 [NO_CHANGE] 만 출력합니다.\n\n"
+    "추가 규칙:\n"
+    "- 기존 글의 스타일, 톤, 형식을 유지합니다.\n"
+    "- 과도한 리라이팅 금지.\n"
+    "- 전체 섹션을 다시 작성하지 않습니다.\n"
+    "- 변경 근거는 파일 요약 및 분석 내용에서만 찾습니다.\n"
+    "- 마크다운 코드블록, 불필요한 텍스트, 해설 금지."
+)
+
 def _build_section_prompt(
     section_key: str,
     old_text: str,
@@ -239,15 +332,7 @@ def _build_section_prompt(
     # ------------------------------------------------------------
     if section_key == "changelog":
 
-        system_prompt = (
-            "당신의 역할은 changelog 작성자입니다.\n"
-            "이번 커밋에서 새로 발생한 변화만을 요약하여 '신규 changelog 항목'만 생성하세요.\n\n"
-            "규칙:\n"
-            "- 기존 changelog 내용은 다시 언급하지 않습니다.\n"
-            "- 출력 형식: 새로운 bullet 한 개 또는 1~3줄의 짧은 항목\n"
-            "- 불필요한 설명, 헤더, Markdown 코드블록 금지\n"
-            "- 커밋과 직접 관련된 변경 사항만 포함\n"
-        )
+        system_prompt = _CHANGELOG_SYSTEM_PROMPT
 
         summaries_text = "\n".join([
             f"- {s.get('file')}: {s.get('summary')}"
@@ -267,27 +352,7 @@ def _build_section_prompt(
     # ------------------------------------------------------------
     # 2) 일반 섹션 — 전체 업그레이드 버전
     # ------------------------------------------------------------
-    system_prompt = (
-        "당신의 역할은 기술 문서 수정 전문가입니다.\n\n"
-        "주어진 섹션의 기존 내용을 읽고, 실제 변경이 필요한 부분만 찾아 최소 단위로 업데이트하세요.\n"
-        "전체 문서를 다시 쓰는 것이 아니라, '변경된 부분만 정확히 생성'해야 합니다.\n\n"
-        "출력 규칙(매우 중요):\n"
-        "1. 기존 문장이 수정되어야 하는 경우:\n"
-        "   - 수정된 문단만 출력하고\n"
-        "   - 맨 앞에 [UPDATE: 기존문구일부] 형태로 표시합니다.\n\n"
-        "2. 새로운 내용이 추가되어야 하는 경우:\n"
-        "   - 추가 문단만 출력하고\n"
-        "   - 맨 앞에 [ADD] 를 붙입니다.\n\n"
-        "3. 변화가 전혀 필요하지 않다면:\n"
-        "   - 오직 [NO_CHANGE] 만 출력합니다.\n\n"
-        "추가 규칙:\n"
-        "- 기존 글의 스타일, 톤, 형식을 유지합니다.\n"
-        "- 과도한 리라이팅 금지.\n"
-        "- 전체 섹션을 다시 작성하지 않습니다.\n"
-        "- 변경 근거는 파일 요약 및 분석 내용에서만 찾습니다.\n"
-        "- 마크다운 코드블록, 불필요한 텍스트, 해설 금지.\n\n"
-        f"현재 섹션: {section_key}"
-    )
+    system_prompt = _SECTION_SYSTEM_PROMPT
 
     summaries_text = "\n".join([
         f"- {s.get('file')} ({s.get('priority')}): {s.get('summary')}"
@@ -295,6 +360,7 @@ def _build_section_prompt(
     ])
 
     user_prompt = (
+        f"현재 섹션: {section_key}\n\n"
         f"현재 섹션의 기존 내용:\n{old_text}\n\n"
         f"커밋 메시지:\n{commit_msg}\n\n"
         f"변경된 파일 요약:\n{summaries_text}\n\n"
@@ -310,11 +376,14 @@ def _build_section_prompt(
     return system_prompt, user_prompt
 
 
-def _update_section_llm(section_key: str, old_text: str, llm: ChatOpenAI, file_summaries: List[dict], analysis: str, commit_msg: str) -> str:
-    """LLM으로 특정 섹션 업데이트 (변경 부분만 생성 후 병합)"""
+def _section_messages(section_key: str, old_text: str, file_summaries: List[dict], analysis: str, commit_msg: str) -> list:
+    """섹션 업데이트 요청 메시지 구성"""
     system, user = _build_section_prompt(section_key, old_text, file_summaries, analysis, commit_msg)
-    messages = [SystemMessage(content=system), HumanMessage(content=user)]
-    resp = invoke_with_retry(llm, messages)
+    return [SystemMessage(content=system), HumanMessage(content=user)]
+
+
+def _apply_section_response(section_key: str, old_text: str, resp: Any) -> str:
+    """LLM 응답(변경 부분)을 기존 섹션 내용과 병합"""
     content = getattr(resp, 'content', '')
     if isinstance(content, list):
         content = '\n'.join(str(c) for c in content)
@@ -329,6 +398,89 @@ def _update_section_llm(section_key: str, old_text: str, llm: ChatOpenAI, file_s
     return _merge_section_changes(old_text, generated)
 
 
+# 섹션 업데이트 결과 캐시: 같은 (모델, 섹션, 기존 내용, 파일 요약, 분석, 커밋 메시지) 요청(웹훅 재전송/재실행 등)은 LLM을 다시 호출하지 않음
+_section_cache: "OrderedDict[str, str]" = OrderedDict()
+
+
+def _section_cache_key(model_name: str, section_key: str, old_text: str, file_summaries: List[dict], analysis: str, commit_msg: str) -> str:
+    # 프롬프트에 실제로 들어가는 부분(상위 5개의 file/summary)만 정규화해 키에 포함
+    # 캐시는 모듈 전역이라 모델별 워크플로우가 공유하므로 모델 이름도 키에 포함
+    summaries = orjson.dumps([[str(s.get('file')), str(s.get('summary'))] for s in file_summaries[:5]]).decode()
+    raw = "\x1f".join((model_name, section_key, old_text, summaries, analysis, commit_msg))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _section_cache_get(key: str) -> Optional[str]:
+    value = _section_cache.get(key)
+    if value is not None:
+        _section_cache.move_to_end(key)
+    return value
+
+
+def _section_cache_put(key: str, value: str) -> None:
+    if _SECTION_CACHE_SIZE <= 0:
+        return
+    _section_cache[key] = value
+    _section_cache.move_to_end(key)
+    while len(_section_cache) > _SECTION_CACHE_SIZE:
+        _section_cache.popitem(last=False)
+
+
+async def _update_section_llm(section_key: str, old_text: str, llm: ChatOpenAI, file_summaries: List[dict], analysis: str, commit_msg: str) -> str:
+    """LLM으로 특정 섹션 업데이트 (변경 부분만 생성 후 병합)"""
+    messages = _section_messages(section_key, old_text, file_summaries, analysis, commit_msg)
+    resp = await ainvoke_with_retry(llm, messages)
+    return _apply_section_response(section_key, old_text, resp)
+
+
+async def _update_sections_llm(
+    sections: List[tuple[str, str]],
+    llm: ChatOpenAI,
+    file_summaries: List[dict],
+    analysis: str,
+    commit_msg: str,
+    max_concurrency: int
+) -> List[str]:
+    """여러 섹션을 한 번의 abatch로 요청 (입력 순서대로 병합 결과 반환, 캐시에 없는 섹션만 요청, 실패한 섹션만 개별 재시도)"""
+    results: List[Optional[str]] = [None] * len(sections)
+    model_name = str(getattr(llm, 'model_name', '') or '')
+    cache_keys = []
+    pending = []
+    for idx, (section_key, old_text) in enumerate(sections):
+        cache_key = _section_cache_key(model_name, section_key, old_text, file_summaries, analysis, commit_msg)
+        cache_keys.append(cache_key)
+        cached = _section_cache_get(cache_key)
+        if cached is not None:
+            results[idx] = cached
+        else:
+            pending.append(idx)
+    
+    if len(pending) == 1:
+        idx = pending[0]
+        section_key, old_text = sections[idx]
+        results[idx] = await _update_section_llm(section_key, old_text, llm, file_summaries, analysis, commit_msg)
+    elif pending:
+        all_messages = [
+            _section_messages(sections[idx][0], sections[idx][1], file_summaries, analysis, commit_msg)
+            for idx in pending
+        ]
+        responses = await llm.abatch(
+            all_messages,
+            config={"max_concurrency": max_concurrency},
+            return_exceptions=True,
+        )
+        for idx, messages, resp in zip(pending, all_messages, responses):
+            if isinstance(resp, Exception):
+                # 재시도 가능한 오류(rate limit 등)는 백오프 후 재요청, 그 외는 예외 전파
+                resp = await ainvoke_with_retry(llm, messages)
+            section_key, old_text = sections[idx]
+            results[idx] = _apply_section_response(section_key, old_text, resp)
+    
+    for idx in pending:
+        _section_cache_put(cache_keys[idx], results[idx])
+    return results
+
+
 def _merge_changelog(old_content: str, new_entry: str) -> str:
     """Changelog 섹션에 새 항목 추가"""
     if not new_entry or '[NO_CHANGE]' in new_entry:
@@ -342,6 +494,18 @@ def _merge_changelog(old_content: str, new_entry: str) -> str:
     return f"{old_content.rstrip()}\n{new_entry}"
 
 
+def _append_paragraph(lines: List[str], new_text: str) -> None:
+    """줄 리스트 끝의 공백을 걷어내고 빈 줄 하나를 사이에 두고 새 문단 추가 (합친 문자열을 rstrip 후 빈 줄과 함께 이어 붙이는 것과 동일)"""
+    while lines and not lines[-1].strip():
+        lines.pop()
+    if lines:
+        lines[-1] = lines[-1].rstrip()
+    else:
+        lines.append('')
+    lines.append('')
+    lines.extend(new_text.split('\n'))
+
+
 def _merge_section_changes(old_content: str, changes: str) -> str:
     """섹션 변경사항을 기존 내용과 병합"""
     if not changes or '[NO_CHANGE]' in changes:
@@ -350,13 +514,14 @@ def _merge_section_changes(old_content: str, changes: str) -> str:
     # 변경사항이 없는 경우
     if not old_content.strip():
         cleaned = changes.replace('[ADD]', '').replace('[UPDATE:', '').strip()
-        return re.sub(r'\[UPDATE:[^\]]*\]', '', cleaned).strip()
+        return _UPDATE_MARKER_RE.sub('', cleaned).strip()
     
-    result = old_content
+    # 문서는 한 번만 줄 단위로 분리해 두고 모든 [UPDATE] 마커를 같은 줄 리스트 위에서 처리
+    # (마커마다 전체 문자열을 split/join 하지 않음)
+    lines = old_content.split('\n')
     
     # [UPDATE: ...] 마커가 있는 경우: 내용 교체 (먼저 처리)
-    update_pattern = re.compile(r'\[UPDATE:\s*([^\]]+)\]\s*\n*([^\[]*?)(?=\[|$)', re.DOTALL)
-    matches = update_pattern.findall(changes)
+    matches = _UPDATE_RE.findall(changes)
     
     for original_snippet, new_content in matches:
         snippet = original_snippet.strip()
@@ -368,43 +533,30 @@ def _merge_section_changes(old_content: str, changes: str) -> str:
         # 원본에서 해당 텍스트를 포함하는 문단 찾기
         snippet_key = snippet[:30] if len(snippet) > 30 else snippet
         
-        # 줄 단위로 찾기
-        lines = result.split('\n')
-        found = False
+        # 줄 단위로 찾기 - 교체한 내용도 줄 단위로 펼쳐 두어 다음 마커 검색에 그대로 쓰임
         for i, line in enumerate(lines):
             if snippet_key in line or snippet in line:
-                # 해당 줄을 새 내용으로 교체
-                lines[i] = new_text
-                found = True
+                lines[i:i + 1] = new_text.split('\n')
                 break
-        
-        if found:
-            result = '\n'.join(lines)
         else:
-            # 문단 단위로 찾기
-            paragraphs = result.split('\n\n')
+            # 문단 단위로 찾기 (줄 검색에 실패한 드문 경우에만 문자열로 합침)
+            paragraphs = '\n'.join(lines).split('\n\n')
             for i, para in enumerate(paragraphs):
                 if snippet_key in para or snippet in para:
                     paragraphs[i] = new_text
-                    found = True
+                    lines = '\n\n'.join(paragraphs).split('\n')
                     break
-            
-            if found:
-                result = '\n\n'.join(paragraphs)
             else:
                 # 찾지 못하면 끝에 추가
-                result = f"{result.rstrip()}\n\n{new_text}"
-    
-    # [ADD] 마커가 있는 경우: 내용 추가 (나중에 처리)
-    add_pattern = re.compile(r'\[ADD\]\s*\n*([^\[]*?)(?=\[|$)', re.DOTALL)
-    add_matches = add_pattern.findall(changes)
+                _append_paragraph(lines, new_text)
     
-    for add_content in add_matches:
+    # [ADD] 마커가 있는 경우: 내용 추가 (나중에 처리) - 줄 리스트 끝에 붙이고 마지막에 한 번만 join
+    for add_content in _ADD_RE.findall(changes):
         new_text = add_content.strip()
         if new_text:
-            result = f"{result.rstrip()}\n\n{new_text}"
+            _append_paragraph(lines, new_text)
     
-    return result.strip()
+    return '\n'.join(lines).strip()
 
 def _update_section_mock(section_key: str, old_text: str, commit_msg: str) -> str:
     """Mock 모드로 섹션 업데이트 (병합 방식)"""
@@ -417,28 +569,70 @@ def _update_section_mock(section_key: str, old_text: str, commit_msg: str) -> st
     mock_addition = f"\n\n*Updated: {commit_msg[:50]}*"
     return old_text.rstrip() + mock_addition
 
+# 섹션별로 관련 있는 파일 경로 키워드 (changelog는 항상 대상)
+_SECTION_FILE_KEYWORDS = {
+    'overview': ('main', 'app', 'config'),
+    'architecture': ('router', 'endpoint', 'controller'),
+    'modules': ('router', 'endpoint', 'controller', 'model', 'schema', 'entity', 'service', 'handler'),
+}
+
+def _build_keyword_index() -> tuple[re.Pattern, Dict[str, frozenset]]:
+    """키워드 전체를 하나의 정규식으로 묶어 경로 한 번 훑기로 관련 섹션을 모두 찾도록 준비
+    (lookahead로 겹치는 위치까지 매칭, 같은 위치에서 짧은 키워드가 가려져도 접두 키워드의 섹션을 합쳐 둠)"""
+    sections_by_keyword: Dict[str, set] = {}
+    for section_key, keywords in _SECTION_FILE_KEYWORDS.items():
+        for kw in keywords:
+            sections_by_keyword.setdefault(kw, set()).add(section_key)
+    resolved = {
+        kw: frozenset().union(*(secs for other, secs in sections_by_keyword.items() if kw.startswith(other)))
+        for kw in sections_by_keyword
+    }
+    alternation = '|'.join(re.escape(kw) for kw in sorted(resolved, key=len, reverse=True))
+    return re.compile(f'(?=({alternation}))'), resolved
+
+_SECTION_KEYWORD_RE, _KEYWORD_SECTIONS = _build_keyword_index()
+
+def _sections_for_path(path: str) -> set:
+    """파일 경로(소문자)에 등장하는 키워드에 해당하는 섹션 집합"""
+    found = set()
+    for m in _SECTION_KEYWORD_RE.finditer(path):
+        found |= _KEYWORD_SECTIONS[m.group(1)]
+    return found
+
 def _infer_target_sections(changed_files: List[str]) -> List[str]:
     """변경된 파일 기반으로 업데이트할 섹션 추론"""
     targets = set()
     for f in changed_files:
-        lf = f.lower()
-        if any(x in lf for x in ['main','app','config']):
-            targets.add('overview')
-        if any(x in lf for x in ['router','endpoint','controller']):
-            targets.add('architecture'); targets.add('modules')
-        if any(x in lf for x in ['model','schema','entity']):
-            targets.add('modules')
-        if any(x in lf for x in ['service','handler']):
-            targets.add('modules')
-        if any(x in lf for x in ['test','spec']):
-            targets.add('changelog')
+        targets |= _sections_for_path(f.lower())
     targets.add('changelog')  # 항상 changelog 포함
     return list(targets)
 
-def _handle_partial_update(state: DocumentState, llm: Optional[ChatOpenAI], use_mock: bool) -> DocumentState:
+def _should_update_section(section_key: str, file_summaries: List[dict], changed_files: List[str]) -> bool:
+    """섹션과 관련된 파일이 바뀌었는지 빠르게 판단 (False면 LLM 호출 없이 기존 내용 유지)"""
+    if section_key not in _SECTION_FILE_KEYWORDS:
+        # changelog 및 키워드 표에 없는 섹션은 판단 불가 -> LLM에 맡김
+        return True
+    files = [f.lower() for f in changed_files]
+    files.extend(str(s.get('file', '')).lower() for s in file_summaries)
+    return any(section_key in _sections_for_path(lf) for lf in files)
+
+async def _load_existing_content(existing: Dict[str, Any]) -> str:
+    """기존 문서 본문 조회 (state에는 id/title만 있으므로 필요할 때만 id로 가져옴 - state에 다시 싣지 않음)"""
+    if "content" in existing:
+        return existing.get("content") or ""
+    if existing.get("id") is None:
+        return ""
+    async with AsyncSessionLocal() as session:
+        content = (await session.execute(
+            select(Document.content).where(Document.id == existing["id"])
+        )).scalar()
+    return content or ""
+
+
+async def _handle_partial_update(state: DocumentState, llm: Optional[ChatOpenAI], use_mock: bool) -> DocumentState:
     """섹션 단위 부분 업데이트 처리"""
     existing = state.get('existing_document') or {}
-    content = existing.get('content', '')
+    content = await _load_existing_content(existing)
     if not content:
         state['error'] = 'No existing document content for partial update'
         state['status'] = 'error'
@@ -452,73 +646,56 @@ def _handle_partial_update(state: DocumentState, llm: Optional[ChatOpenAI], use_
     commit_msg = (state.get('code_change') or {}).get('commit_message', '')
     target_sections = state.get('target_doc_sections') or _infer_target_sections(changed_files)
     
-    max_chars = int(os.getenv('PARTIAL_DOC_UPDATE_MAX_SECTION_CHARS', '6000'))
+    max_chars = _MAX_SECTION_CHARS
     
-    updates = []
+    updates: List[SectionUpdate] = []
     updated_map: Dict[str, str] = {}
     
     # LLM 초기화
     if not use_mock and llm is None:
-        api_key = os.getenv('OPENAI_API_KEY') or ''
-        if not api_key:
+        if not _OPENAI_KEY:
             use_mock = True
-            print('[DocumentGenerator/Partial] No API key, using mock mode')
+            logger.warning("Partial update: no API key, using mock mode")
         else:
             llm = ChatOpenAI(model='gpt-4o-mini', temperature=0.2)
-            print('[DocumentGenerator/Partial] LLM initialized')
+            logger.debug("Partial update: LLM initialized")
     
-    # 병렬 처리 활성화 여부 (섹션 수 >1 && 환경변수)
-    max_workers = int(os.getenv('PARTIAL_UPDATE_MAX_CONCURRENCY', '3'))
-    max_workers = max(1, max_workers)
-
-    def _process_section(section_key: str) -> tuple[str, str, int, int, bool]:
-        import time
-        import threading
-        thread_id = threading.current_thread().name
-        start = time.time()
-        print(f"  [{thread_id}] 시작: 섹션 '{section_key}' 업데이트")
-        
-        sec_old = parsed.sections.get(section_key, '')
-        if not sec_old and section_key != 'changelog':
-            sec_old = ''
-        trimmed_old = sec_old[:max_chars] if len(sec_old) > max_chars else sec_old
-        if use_mock:
-            new_text_local = _update_section_mock(section_key, trimmed_old, commit_msg)
-        else:
-            # 스레드 안전을 위해 새 LLM 인스턴스를 생성 (모델명 동일)
-            llm_model = getattr(llm, 'model_name', getattr(llm, 'model', 'gpt-4o-mini')) if llm else 'gpt-4o-mini'
-            local_llm = llm if max_workers == 1 else ChatOpenAI(model=llm_model, temperature=0.2)
-            new_text_local = _update_section_llm(section_key, trimmed_old, local_llm, file_summaries, analysis, commit_msg)
-        changed_flag = new_text_local.strip() != sec_old.strip()
-        
-        elapsed = time.time() - start
-        print(f"  [{thread_id}] 완료: 섹션 '{section_key}' ({elapsed:.2f}s, 변경={changed_flag})")
-        return section_key, new_text_local, len(sec_old), len(new_text_local), changed_flag
-
-    if len(target_sections) > 1 and max_workers > 1 and not use_mock:
-        import time
-        workers = min(max_workers, len(target_sections))
-        print(f"[섹션 업데이트 병렬 처리] {len(target_sections)}개 섹션, {workers}개 워커 사용")
-        start_time = time.time()
-        with ThreadPoolExecutor(max_workers=workers) as ex:
-            futures = {ex.submit(_process_section, k): k for k in target_sections}
-            for fut in as_completed(futures):
-                k, new_text, old_len, new_len, changed_flag = fut.result()
-                updated_map[k] = new_text
-                updates.append({'key': k, 'old_length': old_len, 'new_length': new_len, 'changed': changed_flag})
-        elapsed = time.time() - start_time
-        print(f"[섹션 업데이트 병렬 완료] {elapsed:.2f}초 소요")
+    # 동시 LLM 호출 수 상한 (섹션 프롬프트는 한 번에 모아 공유 llm의 abatch로 요청)
+    max_workers = _MAX_WORKERS
+
+    old_texts = [parsed.sections.get(k, '') for k in target_sections]
+    trimmed = [
+        (k, old[:max_chars] if len(old) > max_chars else old)
+        for k, old in zip(target_sections, old_texts)
+    ]
+
+    mode = "배치" if len(target_sections) > 1 and not use_mock else "순차"
+    logger.debug("섹션 업데이트 %s 처리: %d개 섹션, 동시 호출 최대 %d개", mode, len(target_sections), max_workers)
+    start_time = time.time()
+    # 관련 파일이 바뀌지 않은 섹션은 LLM 왕복 없이 [NO_CHANGE]로 처리 (기존 내용 유지)
+    affected = [_should_update_section(k, file_summaries, changed_files) for k in target_sections]
+    new_texts = list(old_texts)
+    pending = [(idx, sec) for idx, sec in enumerate(trimmed) if affected[idx]]
+    if use_mock:
+        generated = [_update_section_mock(k, old, commit_msg) for _, (k, old) in pending]
+    elif pending:
+        generated = await _update_sections_llm([sec for _, sec in pending], llm, file_summaries, analysis, commit_msg, max_workers)
     else:
-        # 순차 처리
-        import time
-        print(f"[섹션 업데이트 순차 처리] {len(target_sections)}개 섹션")
-        start_time = time.time()
-        for k in target_sections:
-            k2, new_text, old_len, new_len, changed_flag = _process_section(k)
-            updated_map[k2] = new_text
-            updates.append({'key': k2, 'old_length': old_len, 'new_length': new_len, 'changed': changed_flag})
-        elapsed = time.time() - start_time
-        print(f"[섹션 업데이트 순차 완료] {elapsed:.2f}초 소요")
+        generated = []
+    for (idx, _), new_text in zip(pending, generated):
+        new_texts[idx] = new_text
+    skipped = len(target_sections) - len(pending)
+    if skipped:
+        logger.debug("관련 변경 없음 -> %d개 섹션 LLM 호출 생략", skipped)
+    for k, sec_old, new_text in zip(target_sections, old_texts, new_texts):
+        changed_flag = new_text.strip() != sec_old.strip()
+        updated_map[k] = new_text
+        updates.append(SectionUpdate(k, len(sec_old), len(new_text), changed_flag))
+    elapsed = time.time() - start_time
+    logger.debug("섹션 업데이트 %s 완료: %.2fs", mode, elapsed)
+    if logger.isEnabledFor(logging.DEBUG):
+        for u in updates:
+            logger.debug("section %s changed=%s (%d -> %d chars)", u.key, u.changed, u.old_length, u.new_length)
     
     # 섹션 병합
     merged_body = _merge_sections(parsed, updated_map)
@@ -530,8 +707,8 @@ def _handle_partial_update(state: DocumentState, llm: Optional[ChatOpenAI], use_
     state['document_summary'] = f"Incremental update applied to sections: {', '.join(target_sections)}"
     state['status'] = 'saving'
     
-    print(f"[DocumentGenerator/Partial] Updated {len(updates)} sections: {', '.join(target_sections)}")
+    logger.info("Partial update applied to %d sections: %s", len(updates), ', '.join(target_sections))
     return state
 
 def _env_partial_update_enabled() -> bool:
-    return os.getenv("PARTIAL_DOC_UPDATE", "false").lower() in {"1","true","yes"}
+    return _PARTIAL_UPDATE_ENABLED
@@ -1,4 +1,8 @@
-from datetime import datetime
+from typing import Any, Dict, Tuple
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
 from database import SessionLocal
 from models import Document
 
@@ -40,80 +44,18 @@ def document_saver_node(state: DocumentState) -> DocumentState:
             * document_type = "auto"
     """
     try:
-        # 문서 본문이 없다면 저장을 진행할 수 없으므로 바로 실패 처리
-        document_content = state.get("document_content")
-        document_summary = state.get("document_summary")
-        if not document_content:
-            state["status"] = "error"
-            state["error"] = "Document content missing before save"
+        session = state.get("db_session")
+        if session is not None:
+            # 워크플로우가 연 세션(트랜잭션)에 기록만 하고 commit은 그래프 종료 후 aprocess가 한 번 수행
+            _save_document(session, state)
             return state
-        if document_summary is None:
-            state["status"] = "error"
-            state["error"] = "Document summary missing before save"
-            return state
-
-        session = SessionLocal()
         
+        session = SessionLocal()
         try:
-            should_update = state.get("should_update", False)
-            code_change_id = state.get("code_change_id")
-            if code_change_id is None:
-                raise ValueError("code_change_id missing before save")
-            code_change = state.get("code_change", {})
-            commit_sha = code_change.get("commit_sha", "") if code_change else ""
-            
-            if should_update:
-                # 기존 문서 업데이트
-                existing_doc = state.get("existing_document", {})
-                doc_id = existing_doc.get("id") if existing_doc else None
-                
-                if not doc_id:
-                    raise ValueError("Document ID not found for update")
-                
-                document = session.query(Document).filter(Document.id == doc_id).first()
-                
-                if not document:
-                    raise ValueError(f"Document not found: {doc_id}")
-                
-                # 문서 업데이트
-                setattr(document, "content", document_content)
-                setattr(document, "summary", document_summary)
-                setattr(document, "status", "generated")
-                setattr(document, "updated_at", datetime.utcnow())
-                
-                state["document_id"] = int(getattr(document, "id"))
-                state["action"] = "updated"
-                    
-            else:
-                # 신규 문서 생성
-                document_title = state.get("document_title")
-                if not document_title:
-                    raise ValueError("Document title missing before save")
-
-                document = Document(
-                    title=document_title,
-                    content=document_content,
-                    summary=document_summary,
-                    status="generated",
-                    document_type="auto",
-                    commit_sha=commit_sha,
-                    repository_name=state.get("repository_name"),
-                    code_change_id=code_change_id,
-                    generation_metadata={
-                        "analysis_result": state.get("analysis_result"),
-                        "changed_files": state.get("changed_files"),
-                    }
-                )
-                session.add(document)
-                session.flush()
-                
-                state["document_id"] = int(getattr(document, "id"))
-                state["action"] = "created"
-            
-            session.commit()
-            state["status"] = "completed"
+            _save_document(session, state)
+            if state.get("status") == "completed":
+                session.commit()
             return state
-            
         finally:
             session.close()
             
@@ -121,3 +63,90 @@ def document_saver_node(state: DocumentState) -> DocumentState:
         state["error"] = f"Document saver failed: {str(e)}"
         state["status"] = "error"
         return state
+
+
+def _document_values(state: DocumentState) -> Tuple[str, Dict[str, Any]]:
+    """state -> ("update" | "create", 저장할 컬럼 값) (저장할 수 없는 state면 ValueError)"""
+    document_content = state.get("document_content")
+    document_summary = state.get("document_summary")
+    should_update = state.get("should_update", False)
+    code_change_id = state.get("code_change_id")
+    if code_change_id is None:
+        raise ValueError("code_change_id missing before save")
+    code_change = state.get("code_change", {})
+    commit_sha = code_change.get("commit_sha", "") if code_change else ""
+    
+    if should_update:
+        # 기존 문서 업데이트
+        existing_doc = state.get("existing_document", {})
+        doc_id = existing_doc.get("id") if existing_doc else None
+        
+        if not doc_id:
+            raise ValueError("Document ID not found for update")
+        
+        return "update", {
+            "id": doc_id,
+            "content": document_content,
+            "summary": document_summary,
+        }
+    
+    # 신규 문서 생성
+    document_title = state.get("document_title")
+    if not document_title:
+        raise ValueError("Document title missing before save")
+    
+    return "create", {
+        "title": document_title,
+        "content": document_content,
+        "summary": document_summary,
+        "status": "generated",
+        "document_type": "auto",
+        "commit_sha": commit_sha,
+        "repository_name": state.get("repository_name"),
+        "code_change_id": code_change_id,
+        "generation_metadata": {
+            "analysis_result": state.get("analysis_result"),
+            "changed_files": state.get("changed_files"),
+        },
+    }
+
+
+def _save_document(session: Session, state: DocumentState) -> None:
+    """
+    state의 문서를 저장하고 결과(document_id / action / status)를 state에 기록 (커밋은 호출자가 수행)
+    
+    - 업데이트는 ORM 로드/더티 트래킹 없이 PK 기준 Core UPDATE 한 문장, 신규 문서는 INSERT ... RETURNING 한 문장
+    - 저장할 수 없는 state는 status="error"
+    """
+    # 문서 본문이 없다면 저장을 진행할 수 없으므로 바로 실패 처리
+    if not state.get("document_content"):
+        state["status"] = "error"
+        state["error"] = "Document content missing before save"
+        return
+    if state.get("document_summary") is None:
+        state["status"] = "error"
+        state["error"] = "Document summary missing before save"
+        return
+    try:
+        action, values = _document_values(state)
+        if action == "update":
+            # updated_at은 컬럼 onupdate(func.now())로 DB가 채움, 대상 행이 없으면 rowcount 0
+            result = session.execute(
+                update(Document)
+                .where(Document.id == values["id"])
+                .values(content=values["content"], summary=values["summary"], status="generated")
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0:
+                raise ValueError(f"Document not found: {values['id']}")
+            doc_id = values["id"]
+        else:
+            doc_id = session.execute(insert(Document).returning(Document.id), values).scalar_one()
+    except ValueError as e:
+        state["error"] = f"Document saver failed: {str(e)}"
+        state["status"] = "error"
+        return
+    
+    state["document_id"] = int(doc_id)
+    state["action"] = "updated" if action == "update" else "created"
+    state["status"] = "completed"
@@ -5,10 +5,17 @@ File Parser 노드 (경량 오케스트레이터)
 - Tree-sitter 사용 가능 시 우선 사용, 불가하면 언어별 Fallback으로 파싱
 - Mock 모드 제공
 """
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from typing import Dict, Any
 
 FULL_CODE_LIMIT = int(os.getenv("FILE_PARSER_FULL_CODE_LIMIT", "30000"))  # bytes/characters threshold
+MAX_WORKERS = int(os.getenv("FILE_PARSER_MAX_WORKERS", str(os.cpu_count() or 1)))  # 프로세스 풀 크기
+PARALLEL_MIN_FILES = int(os.getenv("FILE_PARSER_PARALLEL_MIN_FILES", "64"))  # 이 개수 이상일 때만 프로세스 풀 사용
+READ_BUFFER_SIZE = 1 << 17  # 파일 읽기 버퍼 (128KiB)
+PREFETCH_ENABLED = os.getenv("FILE_PARSER_PREFETCH", "true").lower() == "true"  # 파싱 전 커널 readahead 힌트
 
 from ..document_state import DocumentState
 from .parser.tree_sitter_parser import parse_with_best_effort
@@ -34,30 +41,19 @@ def file_parser_node(state: DocumentState, use_mock: bool = False) -> DocumentSt
             print(f"[FileParser] Mock parsing completed for {len(parsed_files)} files")
             return state
 
-        parsed_files = []
-        for file_info in code_files:
-            try:
-                lang = _resolve_language(file_info)
-                rel_path = str(file_info.get("path") or "")
-                file_path = str(file_info.get("full_path") or os.path.join(repository_path, rel_path))
-
-                if not file_path or not os.path.exists(file_path):
-                    parsed_files.append(_minimal_error_record(file_info, "File not found"))
-                    continue
-
-                with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read()
-
-                result = parse_with_best_effort(content, file_info, lang)
-                # 표준화: file_path는 상대 경로 유지
-                result["file_path"] = file_info.get("path", result.get("file_path", ""))
-                # full_code 포함 (크기 제한 내)
-                if len(content) <= FULL_CODE_LIMIT:
-                    result["full_code"] = content
-                parsed_files.append(result)
-            except Exception as e:
-                print(f"[FileParser] Failed to parse {file_info.get('path', 'unknown')}: {e}")
-                parsed_files.append(_minimal_error_record(file_info, str(e)))
+        # 저장소 경로는 한 번만 정규화해 두고 파일마다 접두어로 붙임 (full_path가 없을 때만 사용)
+        repo_prefix = os.path.join(os.path.normpath(repository_path), "") if repository_path else ""
+        _prefetch_files(code_files, repo_prefix)
+        parse_one = partial(_parse_one, repo_prefix=repo_prefix)
+        if len(code_files) >= PARALLEL_MIN_FILES and MAX_WORKERS > 1:
+            # tree-sitter 파싱 + 후처리는 CPU 바운드 -> 프로세스 풀로 코어 수만큼 분산
+            # (비동기 서버의 워커 스레드에서 fork하지 않도록 spawn 컨텍스트 사용)
+            workers = min(MAX_WORKERS, len(code_files))
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as ex:
+                parsed_files = list(ex.map(parse_one, code_files, chunksize=8))
+        else:
+            # 파일 수가 적으면 프로세스 기동 비용이 더 크므로 현재 스레드에서 처리
+            parsed_files = [parse_one(fi) for fi in code_files]
 
         state["parsed_files"] = parsed_files
         state["status"] = "summarizing_files"
@@ -69,24 +65,84 @@ def file_parser_node(state: DocumentState, use_mock: bool = False) -> DocumentSt
         return state
 
 
+def _prefetch_files(code_files, repo_prefix: str) -> None:
+    """파싱 전에 모든 파일에 POSIX_FADV_WILLNEED 힌트를 걸어 커널이 디스크 읽기를 미리 병렬로 진행하도록 함
+
+    콜드 캐시에서 파일을 하나씩 읽을 때 생기는 순차 I/O 대기를 줄이기 위함 (posix_fadvise 미지원 플랫폼은 건너뜀)
+    """
+    if not PREFETCH_ENABLED or not hasattr(os, "posix_fadvise"):
+        return
+    for file_info in code_files:
+        try:
+            fd = os.open(_full_path(file_info, repo_prefix), os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def _full_path(file_info: Dict[str, Any], repo_prefix: str) -> str:
+    return str(file_info.get("full_path") or repo_prefix + str(file_info.get("path") or ""))
+
+
+def _parse_one(file_info: Dict[str, Any], repo_prefix: str) -> Dict[str, Any]:
+    """파일 하나 파싱 (프로세스 풀에서 실행되도록 모듈 최상위 함수로 유지)"""
+    try:
+        lang = _resolve_language(file_info)
+        file_path = _full_path(file_info, repo_prefix)
+
+        if not file_path:
+            return _minimal_error_record(file_info, "File not found")
+        try:
+            os.stat(file_path)
+        except OSError:
+            return _minimal_error_record(file_info, "File not found")
+
+        # 텍스트 모드의 증분 디코딩 대신 바이트로 한 번에 읽고 한 번만 디코딩
+        with open(file_path, "rb", buffering=READ_BUFFER_SIZE) as f:
+            content = f.read().decode("utf-8", "ignore")
+        # 텍스트 모드의 universal newlines와 동일하게 CRLF/CR을 LF로 정규화 (full_code/파서에 '\r'이 섞이지 않도록)
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+
+        result = parse_with_best_effort(content, file_info, lang)
+        # 표준화: file_path는 상대 경로 유지
+        result["file_path"] = file_info.get("path", result.get("file_path", ""))
+        # full_code 포함 (크기 제한 내, 바이트가 아닌 문자 수 기준)
+        if len(content) <= FULL_CODE_LIMIT:
+            result["full_code"] = content
+        return result
+    except Exception as e:
+        print(f"[FileParser] Failed to parse {file_info.get('path', 'unknown')}: {e}")
+        return _minimal_error_record(file_info, str(e))
+
+
+# 확장자 -> 언어 매핑 (호출마다 dict를 새로 만들지 않도록 모듈 수준에 유지)
+_EXT_LANGUAGE = {
+    ".py": "python",
+    ".js": "javascript",
+    ".mjs": "javascript",
+    ".ts": "typescript",
+    ".java": "java",
+    ".cpp": "cpp",
+    ".cc": "cpp",
+    ".cxx": "cpp",
+    ".c": "c",
+    ".go": "go",
+}
+
+
 def _resolve_language(file_info: Dict[str, Any]) -> str:
     lang = (file_info.get("language") or "").lower()
     if lang:
         return lang
     path = file_info.get("path", "")
     ext = os.path.splitext(path)[1].lower()
-    return {
-        ".py": "python",
-        ".js": "javascript",
-        ".mjs": "javascript",
-        ".ts": "typescript",
-        ".java": "java",
-        ".cpp": "cpp",
-        ".cc": "cpp",
-        ".cxx": "cpp",
-        ".c": "c",
-        ".go": "go",
-    }.get(ext, "unknown")
+    return _EXT_LANGUAGE.get(ext, "unknown")
 
 
 def _minimal_error_record(file_info: Dict[str, Any], message: str) -> Dict[str, Any]:
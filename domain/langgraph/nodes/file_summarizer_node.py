@@ -2,18 +2,24 @@
 File Summarizer Node - LLM 기반 파일 요약 생성
 """
 
-import json
 import os
 from typing import Dict, List, Optional, Any, Callable
 from pathlib import Path
+from functools import lru_cache
 from concurrent.futures import ThreadPoolExecutor, as_completed
+import logging
 import time
-import threading
+
+import orjson
 
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 
+from app.logging_config import get_logger
 from ..document_state import DocumentState
+from ..utils.keyword_match import first_keyword_match
+
+logger = get_logger("langgraph.file_summarizer")
 
 
 # ============================================================
@@ -24,18 +30,28 @@ class FileSummarizerConfig:
     """Summarizer 관련 환경 설정"""
     DEFAULT_MODEL = os.getenv("DOC_SUMMARIZER_MODEL", "gpt-5")
     SUMMARY_LIMIT = int(os.getenv("FILE_SUMMARY_LIMIT", "30"))
+    BATCH_SIZE = int(os.getenv("FILE_SUMMARIZER_BATCH_SIZE", "4"))  # LLM 호출 1회당 요약할 파일 수 (1이면 파일별 호출)
+    MAX_CONCURRENCY = max(1, int(os.getenv("FILE_SUMMARIZER_MAX_CONCURRENCY", "4")))
 
     @staticmethod
     def limit_files(files: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """파일 개수 제한 적용"""
-        if len(files) > FileSummarizerConfig.SUMMARY_LIMIT > 0:
-            print(
-                f"[FileSummarizer] Limiting {len(files)} → {FileSummarizerConfig.SUMMARY_LIMIT}"
-            )
-            return files[:FileSummarizerConfig.SUMMARY_LIMIT]
+        limit = FileSummarizerConfig.SUMMARY_LIMIT
+        if len(files) > limit > 0:
+            logger.info("Limiting %d → %d files", len(files), limit)
+            return files[:limit]
         return files
 
 
+def _code_elements(file_info: Dict[str, Any]) -> tuple:
+    """(functions, classes, imports)를 한 번씩만 조회 (없으면 빈 튜플 - 기본값 리스트를 매번 만들지 않음)"""
+    return (
+        file_info.get("functions") or (),
+        file_info.get("classes") or (),
+        file_info.get("imports") or (),
+    )
+
+
 def set_error(state: DocumentState, message: str) -> DocumentState:
     state["error"] = message
     state["status"] = "error"
@@ -64,60 +80,65 @@ def file_summarizer_node(
     parsed_files = FileSummarizerConfig.limit_files(parsed_files)
     repository_path = str(state.get("repository_path", "") or "")
 
-    print(f"[FileSummarizer] Target files: {len(parsed_files)}")
+    logger.info("Target files: %d", len(parsed_files))
 
     # --- Decide Strategy ---
     # include_full_code 우선 순위: 함수 인자 > 환경변수 > False
     use_full_code = include_full_code if include_full_code is not None else INCLUDE_FULL_CODE
 
     summarizer = _get_summarizer_strategy(use_mock, openai_api_key, use_full_code)
+    batch_summarizer = _get_batch_summarizer(use_mock, openai_api_key, use_full_code)
+
+    # 병렬 처리 설정 (import 시점에 한 번 읽은 값 사용)
+    max_workers = FileSummarizerConfig.MAX_CONCURRENCY
 
-    # 병렬 처리 설정
-    max_workers = int(os.getenv("FILE_SUMMARIZER_MAX_CONCURRENCY", "4"))
-    max_workers = max(1, max_workers)
+    # LLM 모드에서는 BATCH_SIZE개 파일을 한 번의 호출로 요약 (Mock/배치 비활성 시 파일 1개 단위)
+    batch_size = FileSummarizerConfig.BATCH_SIZE if batch_summarizer else 1
+    batches = [parsed_files[i:i + batch_size] for i in range(0, len(parsed_files), batch_size)]
 
     file_summaries = []
     
-    def _process_file(idx: int, file_info: Dict[str, Any]) -> Dict[str, Any]:
-        thread_id = threading.current_thread().name
-        file_path = file_info.get('file_path', 'unknown')
-        start = time.time()
-        print(f"  [{thread_id}] 시작: {idx}/{len(parsed_files)} - {file_path}")
-        
-        summary = summarizer(file_info, repository_path)
-        
-        elapsed = time.time() - start
-        print(f"  [{thread_id}] 완료: {file_path} ({elapsed:.2f}s)")
-        return summary
-
-    if len(parsed_files) > 1 and max_workers > 1 and not use_mock:
-        workers = min(max_workers, len(parsed_files))
-        print(f"[파일 요약 병렬 처리] {len(parsed_files)}개 파일, {workers}개 워커 사용")
-        start_time = time.time()
+    def _process_batch(idx: int, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # 스레드 이름/시각은 로그 포맷터가 채우므로 DEBUG가 꺼져 있으면 문자열 생성도 생략
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            file_paths = ", ".join(f.get('file_path', 'unknown') for f in batch)
+            start = time.perf_counter()
+            logger.debug("시작: %d/%d - %s", idx, len(batches), file_paths)
+
+        summaries = batch_summarizer(batch, repository_path) if len(batch) > 1 else None
+        if summaries is None:
+            # 단일 파일이거나 배치 응답이 유효하지 않으면 파일별 요약으로 처리
+            summaries = [summarizer(file_info, repository_path) for file_info in batch]
+
+        if debug:
+            logger.debug("완료: %s (%.2fs)", file_paths, time.perf_counter() - start)
+        return summaries
+
+    if len(batches) > 1 and max_workers > 1 and not use_mock:
+        workers = min(max_workers, len(batches))
+        logger.debug("파일 요약 병렬 처리: %d개 파일, %d개 배치, %d개 워커", len(parsed_files), len(batches), workers)
+        start_time = time.perf_counter()
         
         with ThreadPoolExecutor(max_workers=workers) as ex:
-            futures = {ex.submit(_process_file, idx, f): idx for idx, f in enumerate(parsed_files, 1)}
+            futures = {ex.submit(_process_batch, idx, b): idx for idx, b in enumerate(batches, 1)}
             for fut in as_completed(futures):
-                file_summaries.append(fut.result())
+                file_summaries.extend(fut.result())
         
-        elapsed = time.time() - start_time
-        print(f"[파일 요약 병렬 완료] {elapsed:.2f}초 소요")
+        logger.debug("파일 요약 병렬 완료: %.2f초 소요", time.perf_counter() - start_time)
     else:
-        print(f"[파일 요약 순차 처리] {len(parsed_files)}개 파일")
-        start_time = time.time()
+        logger.debug("파일 요약 순차 처리: %d개 파일", len(parsed_files))
+        start_time = time.perf_counter()
         
-        for idx, file_info in enumerate(parsed_files, 1):
-            print(f"[FileSummarizer] Summarizing {idx}/{len(parsed_files)}: {file_info.get('file_path')}")
-            summary = summarizer(file_info, repository_path)
-            file_summaries.append(summary)
+        for idx, batch in enumerate(batches, 1):
+            file_summaries.extend(_process_batch(idx, batch))
         
-        elapsed = time.time() - start_time
-        print(f"[파일 요약 순차 완료] {elapsed:.2f}초 소요")
+        logger.debug("파일 요약 순차 완료: %.2f초 소요", time.perf_counter() - start_time)
 
     state["file_summaries"] = file_summaries
     state["status"] = "generating_document"
 
-    print(f"[FileSummarizer] Completed: {len(file_summaries)} summaries")
+    logger.info("Completed: %d summaries", len(file_summaries))
     return state
 
 
@@ -125,60 +146,75 @@ def file_summarizer_node(
 # Strategy Selector (Mock / LLM / Fallback)
 # ============================================================
 
+@lru_cache(maxsize=8)
 def _get_summarizer_strategy(
     use_mock: bool,
     openai_api_key: Optional[str],
     use_full_code: bool
 ) -> Callable:
-
+    """전략 함수 반환 - 같은 설정이면 ChatOpenAI 클라이언트(커넥션 풀 포함)를 재사용하도록 캐시"""
     if use_mock:
         return lambda info, repo: _generate_mock_file_summary(info, use_full_code)
 
     if not openai_api_key:
-        print("[FileSummarizer] No API key → switching to mock mode.")
+        logger.warning("No API key → switching to mock mode.")
         return lambda info, repo: _generate_mock_file_summary(info, use_full_code)
 
     # Real LLM strategy
-    llm = ChatOpenAI(
-        api_key=lambda: openai_api_key,
-        model=FileSummarizerConfig.DEFAULT_MODEL,
-        temperature=0.1,
-    )
+    llm = _get_llm(openai_api_key)
     return lambda info, repo: (
         _generate_file_summary_with_llm(info, llm, repo, use_full_code)
         or _generate_fallback_file_summary(info)
     )
 
 
+def _get_batch_summarizer(
+    use_mock: bool,
+    openai_api_key: Optional[str],
+    use_full_code: bool
+) -> Optional[Callable]:
+    """여러 파일을 한 번에 요약하는 전략 반환 (Mock 모드/API 키 없음/배치 비활성 시 None)"""
+    if use_mock or not openai_api_key or FileSummarizerConfig.BATCH_SIZE <= 1:
+        return None
+    llm = _get_llm(openai_api_key)
+    return lambda infos, repo: _generate_file_summaries_batch_with_llm(infos, llm, repo, use_full_code)
+
+
+@lru_cache(maxsize=4)
+def _get_llm(openai_api_key: str) -> ChatOpenAI:
+    return ChatOpenAI(
+        api_key=lambda: openai_api_key,
+        model=FileSummarizerConfig.DEFAULT_MODEL,
+        temperature=0.1,
+        # JSON 모드: 응답이 항상 JSON 객체이므로 코드펜스 탐색 없이 바로 파싱
+        model_kwargs={"response_format": {"type": "json_object"}},
+    )
+
+
 # ============================================================
 # Mock Summary Generator
 # ============================================================
 
+# 파일명 키워드 -> (purpose, role), 앞선 항목 우선
+_match_mock_pattern = first_keyword_match([
+    (("애플리케이션의 진입점 역할", "초기화 및 설정 모듈"), ("main",)),
+    (("데이터 모델 정의", "스키마 및 ORM 매핑"), ("model",)),
+    (("데이터 구조 정의", "Pydantic 기반 검증"), ("schema",)),
+    (("테스트 모듈", "테스트 케이스 실행 및 검증"), ("test",)),
+    (("API 라우팅 기능", "엔드포인트 관리"), ("router",)),
+    (("비즈니스 로직 처리", "서비스 계층 역할"), ("service",)),
+])
+
+
 def _generate_mock_file_summary(file_info: Dict[str, Any], use_full_code: bool) -> Dict[str, Any]:
     """Mock 파일 요약 생성"""
     file_path = file_info.get("file_path", "")
     language = file_info.get("language", "")
-    functions, classes, imports = (
-        file_info.get("functions", []),
-        file_info.get("classes", []),
-        file_info.get("imports", []),
-    )
+    functions, classes, imports = _code_elements(file_info)
 
     file_name = Path(file_path).stem
 
-    mock_patterns = {
-        "main": ("애플리케이션의 진입점 역할", "초기화 및 설정 모듈"),
-        "model": ("데이터 모델 정의", "스키마 및 ORM 매핑"),
-        "schema": ("데이터 구조 정의", "Pydantic 기반 검증"),
-        "test": ("테스트 모듈", "테스트 케이스 실행 및 검증"),
-        "router": ("API 라우팅 기능", "엔드포인트 관리"),
-        "service": ("비즈니스 로직 처리", "서비스 계층 역할"),
-    }
-
-    purpose, role = next(
-        ((v[0], v[1]) for k, v in mock_patterns.items() if k in file_name.lower()),
-        (f"{language.title()} 기능 모듈", "모듈 기능 제공"),
-    )
+    purpose, role = _match_mock_pattern(file_name.lower()) or (f"{language.title()} 기능 모듈", "모듈 기능 제공")
 
     code_block = None
     if use_full_code and isinstance(file_info.get("full_code"), str):
@@ -227,7 +263,6 @@ def _generate_file_summary_with_llm(
 ) -> Optional[Dict[str, Any]]:
 
     try:
-        file_path = file_info.get("file_path", "")
         preview = _get_file_content_preview(file_info, repository_path, use_full_code)
 
         system_prompt = _build_system_prompt(file_info)
@@ -239,37 +274,71 @@ def _generate_file_summary_with_llm(
         ]
 
         response = llm.invoke(messages)
-        text = _extract_text(response.content)
-
-        json_block = _extract_json(text)
-        data = json.loads(json_block)
-
-        return {
-            "file_path": file_path,
-            "language": file_info.get("language", ""),
-            "summary": {
-                **data,
-                "functions_count": len(file_info.get("functions", [])),
-                "classes_count": len(file_info.get("classes", [])),
-                "imports_count": len(file_info.get("imports", [])),
-                "loc": file_info.get("loc", 0),
-            },
-            "generated_at": "llm",
-            "generation_method": "llm",
-            "included_full_code": use_full_code and isinstance(file_info.get("full_code"), str)
-            #"full_code": file_info.get("full_code") if use_full_code else None,
-        }
+        data = orjson.loads(_extract_text(response.content))
+        return _llm_summary_record(file_info, data, use_full_code)
+
+    except Exception as e:
+        logger.warning("LLM failure for %s: %s", file_info.get('file_path'), e)
+        return None
+
+
+def _generate_file_summaries_batch_with_llm(
+    file_infos: List[Dict[str, Any]],
+    llm: ChatOpenAI,
+    repository_path: str,
+    use_full_code: bool,
+) -> Optional[List[Dict[str, Any]]]:
+    """여러 파일을 한 번의 LLM 호출로 요약 (응답 개수가 맞지 않거나 실패하면 None -> 파일별 요약으로 대체)"""
+    try:
+        sections = []
+        for i, file_info in enumerate(file_infos, 1):
+            preview = _get_file_content_preview(file_info, repository_path, use_full_code)
+            sections.append(f"---FILE {i}---\n{_build_file_header(file_info)}\n{_build_file_body(file_info, preview)}")
+
+        messages = [
+            SystemMessage(content=_BATCH_SYSTEM_PROMPT),
+            HumanMessage(content="\n".join(sections) + _BATCH_USER_GUIDE.format(count=len(file_infos))),
+        ]
+
+        response = llm.invoke(messages)
+        data = orjson.loads(_extract_text(response.content))
+        items = data.get("files") if isinstance(data, dict) else None
+        if not isinstance(items, list) or len(items) != len(file_infos) or not all(isinstance(d, dict) for d in items):
+            logger.warning("Batch response mismatch (%d files) → per-file fallback", len(file_infos))
+            return None
+
+        return [_llm_summary_record(fi, d, use_full_code) for fi, d in zip(file_infos, items)]
 
     except Exception as e:
-        print(f"[FileSummarizer] LLM failure for {file_info.get('file_path')}: {e}")
+        logger.warning("Batch LLM failure (%d files): %s", len(file_infos), e)
         return None
 
 
+def _llm_summary_record(file_info: Dict[str, Any], data: Dict[str, Any], use_full_code: bool) -> Dict[str, Any]:
+    functions, classes, imports = _code_elements(file_info)
+    return {
+        "file_path": file_info.get("file_path", ""),
+        "language": file_info.get("language", ""),
+        "summary": {
+            **data,
+            "functions_count": len(functions),
+            "classes_count": len(classes),
+            "imports_count": len(imports),
+            "loc": file_info.get("loc", 0),
+        },
+        "generated_at": "llm",
+        "generation_method": "llm",
+        "included_full_code": use_full_code and isinstance(file_info.get("full_code"), str)
+        #"full_code": file_info.get("full_code") if use_full_code else None,
+    }
+
+
 # ============================================================
 # Fallback Summary
 # ============================================================
 
 def _generate_fallback_file_summary(file_info: Dict[str, Any]) -> Dict[str, Any]:
+    functions, classes, imports = _code_elements(file_info)
     return {
         "file_path": file_info.get("file_path"),
         "language": file_info.get("language"),
@@ -277,15 +346,15 @@ def _generate_fallback_file_summary(file_info: Dict[str, Any]) -> Dict[str, Any]
             "purpose": "언어 기반 기본 소스 파일",
             "role": "구현 및 기능 제공",
             "key_features": [
-                f"{len(file_info.get('functions', []))}개 함수",
-                f"{len(file_info.get('classes', []))}개 클래스",
+                f"{len(functions)}개 함수",
+                f"{len(classes)}개 클래스",
             ],
             "complexity_assessment": "분석 실패",
             "dependency_analysis": ["자동 분석 실패"],
             "maintainability": "검토 필요",
-            "functions_count": len(file_info.get("functions", [])),
-            "classes_count": len(file_info.get("classes", [])),
-            "imports_count": len(file_info.get("imports", [])),
+            "functions_count": len(functions),
+            "classes_count": len(classes),
+            "imports_count": len(imports),
             "loc": file_info.get("loc", 0)
         },
         "generated_at": "fallback",
@@ -297,19 +366,7 @@ def _generate_fallback_file_summary(file_info: Dict[str, Any]) -> Dict[str, Any]
 # Prompt Builders & Helpers
 # ============================================================
 
-def _build_system_prompt(file_info: Dict[str, Any]) -> str:
-    return f"""
-당신은 대규모 소프트웨어 리포지토리 분석 전문가입니다.
-주어진 파일 정보를 기반으로 다음 JSON 스키마에 맞는 파일 요약을 생성하세요.
-모든 필드를 반드시 포함하고, 알 수 없는 정보는 'unknown' 또는 빈 배열로 처리하세요.
-
-파일: {file_info.get("file_path")}
-언어: {file_info.get("language")}
-라인 수: {file_info.get("loc")}
-복잡도: {file_info.get("complexity_score")}
-
-JSON 스키마:
-{{
+_SUMMARY_JSON_SCHEMA = """{
   "file_path": "",
   "directory": "",
   "file_name": "",
@@ -324,17 +381,48 @@ JSON 스키마:
   "functions": [],
   "classes": [],
   "imports": [],
-  "dependencies": {{"internal": [], "external": []}},
-  "architecture_role": {{"layer": "presentation | application | domain | infrastructure | unknown", "upstream": [], "downstream": [], "data_flow": ""}},
+  "dependencies": {"internal": [], "external": []},
+  "architecture_role": {"layer": "presentation | application | domain | infrastructure | unknown", "upstream": [], "downstream": [], "data_flow": ""},
   "api_endpoints": [],
-  "model_schema": {{"fields": []}},
+  "model_schema": {"fields": []},
   "tests": []
-}}
+}"""
+
+_SUMMARY_GUIDELINES = """지침:
+1. 모듈 타입(module_type)은 파일의 역할을 가장 잘 나타내는 한 가지를 선택하세요.
+2. responsibility, summary, key_features를 작성해 파일의 핵심 기능과 역할을 명확히 기술하세요.
+3. architecture_role의 layer, upstream/downstream, data_flow를 가능한 범위 내에서 추론하세요.
+4. exports, functions, classes는 실제 코드 구조 기반으로 작성하세요.
+5. api_endpoints, model_schema, tests는 관련 파일인 경우만 작성하고, 없으면 빈 배열로 처리하세요."""
+
+# 배치 요약용 프롬프트 (파일별 메타데이터는 user 프롬프트의 ---FILE i--- 블록에 포함)
+_BATCH_SYSTEM_PROMPT = f"""
+당신은 대규모 소프트웨어 리포지토리 분석 전문가입니다.
+여러 파일 정보가 ---FILE i--- 구분자로 주어집니다. 각 파일마다 다음 JSON 스키마에 맞는 파일 요약을 생성하세요.
+모든 필드를 반드시 포함하고, 알 수 없는 정보는 'unknown' 또는 빈 배열로 처리하세요.
+응답은 {{"files": [...]}} 형태의 JSON 객체 하나이며, files 배열은 입력 파일 순서와 개수를 그대로 따라야 합니다.
+
+JSON 스키마 (files 배열의 각 원소):
+{_SUMMARY_JSON_SCHEMA}
 """
 
-def _build_user_prompt(file_info: Dict[str, Any], preview: str) -> str:
-    return f"""
-함수 목록:
+_BATCH_USER_GUIDE = f"""
+
+{_SUMMARY_GUIDELINES}
+
+위 {{count}}개 파일 각각에 대해 입력 순서대로 요약을 생성해 {{{{"files": [...]}}}} JSON 객체로 응답하세요.
+"""
+
+
+def _build_file_header(file_info: Dict[str, Any]) -> str:
+    return f"""파일: {file_info.get("file_path")}
+언어: {file_info.get("language")}
+라인 수: {file_info.get("loc")}
+복잡도: {file_info.get("complexity_score")}"""
+
+
+def _build_file_body(file_info: Dict[str, Any], preview: str) -> str:
+    return f"""함수 목록:
 {file_info.get("functions", [])}
 
 클래스 목록:
@@ -344,14 +432,26 @@ def _build_user_prompt(file_info: Dict[str, Any], preview: str) -> str:
 {file_info.get("imports", [])}
 
 파일 내용 미리보기:
-{preview}
+{preview}"""
 
-지침:
-1. 모듈 타입(module_type)은 파일의 역할을 가장 잘 나타내는 한 가지를 선택하세요.
-2. responsibility, summary, key_features를 작성해 파일의 핵심 기능과 역할을 명확히 기술하세요.
-3. architecture_role의 layer, upstream/downstream, data_flow를 가능한 범위 내에서 추론하세요.
-4. exports, functions, classes는 실제 코드 구조 기반으로 작성하세요.
-5. api_endpoints, model_schema, tests는 관련 파일인 경우만 작성하고, 없으면 빈 배열로 처리하세요.
+
+def _build_system_prompt(file_info: Dict[str, Any]) -> str:
+    return f"""
+당신은 대규모 소프트웨어 리포지토리 분석 전문가입니다.
+주어진 파일 정보를 기반으로 다음 JSON 스키마에 맞는 파일 요약을 생성하세요.
+모든 필드를 반드시 포함하고, 알 수 없는 정보는 'unknown' 또는 빈 배열로 처리하세요.
+
+{_build_file_header(file_info)}
+
+JSON 스키마:
+{_SUMMARY_JSON_SCHEMA}
+"""
+
+def _build_user_prompt(file_info: Dict[str, Any], preview: str) -> str:
+    return f"""
+{_build_file_body(file_info, preview)}
+
+{_SUMMARY_GUIDELINES}
 
 위 정보를 기반으로 JSON 형식으로 파일 요약을 생성하세요.
 """
@@ -366,18 +466,6 @@ def _extract_text(content: Any) -> str:
     return str(content)
 
 
-def _extract_json(text: str) -> str:
-    if "```json" in text:
-        start = text.find("```json") + 7
-        end = text.find("```", start)
-        return text[start:end].strip()
-    if "```" in text:
-        start = text.find("```") + 3
-        end = text.find("```", start)
-        return text[start:end].strip()
-    return text
-
-
 def _get_file_content_preview(file_info: Dict[str, Any], repo: str, use_full_code: bool) -> str:
     if use_full_code and isinstance(file_info.get("full_code"), str):
         raw = file_info["full_code"]
@@ -389,12 +477,12 @@ def _get_file_content_preview(file_info: Dict[str, Any], repo: str, use_full_cod
     if preview:
         return preview[:500]
 
-    path = Path(repo) / file_info.get("file_path", "")
-    if path.exists():
-        try:
-            content = path.read_text(errors="ignore")
-        except Exception:
-            return "<read error>"
-        return content[:500]
-
-    return "<no preview available>"
+    # exists() 없이 바로 열고, 미리보기 길이만큼만 읽음
+    path = os.path.join(repo, file_info.get("file_path", ""))
+    try:
+        with open(path, "r", errors="ignore") as f:
+            return f.read(500)
+    except FileNotFoundError:
+        return "<no preview available>"
+    except Exception:
+        return "<read error>"
@@ -3,16 +3,23 @@ Full Repository Document Generator Node
 전체 저장소 문서를 생성하는 LangGraph 노드
 """
 
-import json
+import logging
+import time
 from typing import Dict, List, Optional, Any
 import os
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+import orjson
+
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
+from app.logging_config import get_logger
 from ..document_state import DocumentState
 from ..utils.llm_backoff import invoke_with_retry
+from ..utils.keyword_match import first_keyword_match
+
+logger = get_logger("langgraph.full_repo_document_generator")
 
 
 # ============================================================
@@ -38,61 +45,60 @@ class FullRepoDocumentLLM:
     def _normalize_content(response: Any) -> str:
         content = getattr(response, "content", "")
         if isinstance(content, list):
-            parts: List[str] = []
-            for part in content:
-                if isinstance(part, str):
-                    parts.append(part)
-                else:
-                    try:
-                        parts.append(json.dumps(part, ensure_ascii=False))
-                    except Exception:
-                        parts.append(str(part))
-            content = " "+" ".join(parts) if parts else ""
-        return str(content).strip()
+            # 앞 공백은 strip()으로 어차피 제거되므로 join 한 번으로 처리
+            content = " ".join(
+                part if isinstance(part, str) else FullRepoDocumentLLM._dump_part(part)
+                for part in content
+            )
+        elif not isinstance(content, str):
+            content = str(content)
+        return content.strip()
 
-    def generate_overview(self, files, structure, repo_name) -> str:
-        import time, threading
-        tname = threading.current_thread().name
-        start = time.time()
-        print(f"  [{tname}] Section 'overview' 시작")
-        system_prompt, builder = self.prompt_set["overview"]
+    @staticmethod
+    def _dump_part(part: Any) -> str:
+        try:
+            return orjson.dumps(part).decode()
+        except Exception:
+            return str(part)
+
+    def generate(self, key: str, files, structure, repo_name) -> str:
+        """프롬프트 세트의 key 섹션 생성 (overview / architecture / modules)"""
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            start = time.perf_counter()
+            logger.debug("Section '%s' 시작", key)
+        system_prompt, builder = self.prompt_set[key]
         human_prompt = builder(files, structure, repo_name)
         messages = [SystemMessage(content=system_prompt), HumanMessage(content=human_prompt)]
         resp = invoke_with_retry(self.llm, messages)
         out = self._normalize_content(resp)
-        print(f"  [{tname}] Section 'overview' 완료 ({time.time()-start:.2f}s)")
+        if debug:
+            logger.debug("Section '%s' 완료 (%.2fs)", key, time.perf_counter() - start)
         return out
 
+    def generate_overview(self, files, structure, repo_name) -> str:
+        return self.generate("overview", files, structure, repo_name)
+
     def generate_architecture(self, files, structure, repo_name) -> str:
-        import time, threading
-        tname = threading.current_thread().name
-        start = time.time()
-        print(f"  [{tname}] Section 'architecture' 시작")
-        system_prompt, builder = self.prompt_set["architecture"]
-        human_prompt = builder(files, structure, repo_name)
-        messages = [SystemMessage(content=system_prompt), HumanMessage(content=human_prompt)]
-        resp = invoke_with_retry(self.llm, messages)
-        out = self._normalize_content(resp)
-        print(f"  [{tname}] Section 'architecture' 완료 ({time.time()-start:.2f}s)")
-        return out
+        return self.generate("architecture", files, structure, repo_name)
 
     def generate_key_modules(self, files, structure, repo_name) -> str:
-        import time, threading
-        tname = threading.current_thread().name
-        start = time.time()
-        print(f"  [{tname}] Section 'modules' 시작")
-        system_prompt, builder = self.prompt_set["modules"]
-        human_prompt = builder(files, structure, repo_name)
-        messages = [SystemMessage(content=system_prompt), HumanMessage(content=human_prompt)]
-        resp = invoke_with_retry(self.llm, messages)
-        out = self._normalize_content(resp)
-        print(f"  [{tname}] Section 'modules' 완료 ({time.time()-start:.2f}s)")
-        return out
+        return self.generate("modules", files, structure, repo_name)
 
 
 # ============================================================
 #  Mock Builder – Mock 문서 생성 담당
 # ============================================================
+# Mock 문서의 핵심 모듈 분류 규칙 (경로 부분 문자열 기준, 앞선 규칙 우선)
+_KEY_MODULE_RULES = (
+    ("Entry Point", ("main", "app", "server", "index")),
+    ("Business Logic", ("service", "controller", "handler")),
+    ("Data Model", ("model", "entity", "schema")),
+)
+_match_key_module = first_keyword_match(_KEY_MODULE_RULES)
+_MAX_KEY_MODULES = 8
+
+
 class FullRepoMockBuilder:
     """Mock 문서 생성 전용 클래스"""
 
@@ -116,42 +122,41 @@ class FullRepoMockBuilder:
 
     # ---------- 내부 처리 ----------
     def _collect_stats(self):
-        return {
-            "total_files": len(self.fs),
-            "total_functions": sum(f.get("summary", {}).get("functions_count", 0) for f in self.fs),
-            "total_classes": sum(f.get("summary", {}).get("classes_count", 0) for f in self.fs),
-            "total_loc": sum(f.get("summary", {}).get("loc", 0) for f in self.fs),
-            "languages": self._collect_languages(),
-        }
-
-    def _collect_languages(self):
+        # 함수/클래스/LOC/언어 집계를 한 번의 순회로 처리
+        total_functions = total_classes = total_loc = 0
         langs = {}
         for fs in self.fs:
+            summary = fs.get("summary", {})
+            total_functions += summary.get("functions_count", 0)
+            total_classes += summary.get("classes_count", 0)
+            total_loc += summary.get("loc", 0)
             lang = fs.get("language", "unknown")
             langs[lang] = langs.get(lang, 0) + 1
-        return langs
+        return {
+            "total_files": len(self.fs),
+            "total_functions": total_functions,
+            "total_classes": total_classes,
+            "total_loc": total_loc,
+            "languages": langs,
+        }
 
     def _extract_key_modules(self):
         result = []
         for fs in self.fs:
             path = fs.get("file_path", "").lower()
-            summary = fs.get("summary", {})
-
-            def add(name, t):
-                result.append({
-                    "name": Path(fs["file_path"]).stem,
-                    "type": t,
-                    "description": summary.get("purpose", "")
-                })
-
-            if any(k in path for k in ["main", "app", "server", "index"]):
-                add(path, "Entry Point")
-            elif any(k in path for k in ["service", "controller", "handler"]):
-                add(path, "Business Logic")
-            elif any(k in path for k in ["model", "entity", "schema"]):
-                add(path, "Data Model")
-
-        return result[:8]
+            # 규칙 순서대로 첫 번째로 맞는 유형만 사용
+            module_type = _match_key_module(path)
+            if module_type is None:
+                continue
+            result.append({
+                "name": Path(fs["file_path"]).stem,
+                "type": module_type,
+                "description": fs.get("summary", {}).get("purpose", ""),
+            })
+            if len(result) == _MAX_KEY_MODULES:
+                break
+
+        return result
 
     def _render(self, stats, modules):
         # 가독성 위해 별도 템플릿 함수로 분리 가능
@@ -276,38 +281,33 @@ def full_repository_document_generator_node(
         # 병렬로 각 섹션 생성 (환경변수 FULL_DOC_MAX_CONCURRENCY)
         max_workers = int(os.getenv("FULL_DOC_MAX_CONCURRENCY", "3"))
         max_workers = max(1, min(max_workers, 3))
-        tasks = [
-            ("overview", llm.generate_overview, (file_summaries, repo_struct, repo_name)),
-            ("architecture", llm.generate_architecture, (file_summaries, repo_struct, repo_name)),
-            ("modules", llm.generate_key_modules, (file_summaries, repo_struct, repo_name)),
-        ]
+        section_keys = ("overview", "architecture", "modules")
+        args = (file_summaries, repo_struct, repo_name)
 
         results: Dict[str, str] = {}
         if max_workers > 1:
             print(f"[FullRepoDocGen] Generating sections in parallel (workers={max_workers})")
             with ThreadPoolExecutor(max_workers=max_workers) as ex:
-                futures = {ex.submit(func, *args): key for key, func, args in tasks}
+                futures = {ex.submit(llm.generate, key, *args): key for key in section_keys}
                 for fut in as_completed(futures):
                     key = futures[fut]
                     try:
                         results[key] = fut.result()
-                        print(f"[FullRepoDocGen] Section '{key}' generated")
                     except Exception as se:
                         print(f"[FullRepoDocGen] Section '{key}' failed: {se}")
                         results[key] = ""
         else:
             print("[FullRepoDocGen] Generating sections sequentially")
-            for key, func, args in tasks:
-                print(f"[FullRepoDocGen] Generating {key}...")
+            for key in section_keys:
                 try:
-                    results[key] = func(*args)
+                    results[key] = llm.generate(key, *args)
                 except Exception as se:
                     print(f"[FullRepoDocGen] Section '{key}' failed: {se}")
                     results[key] = ""
 
-        doc_builder.add("overview", results.get("overview", ""))
-        doc_builder.add("architecture", results.get("architecture", ""))
-        doc_builder.add("modules", results.get("modules", ""))
+        # as_completed 순서와 무관하게 섹션 순서 고정
+        for key in section_keys:
+            doc_builder.add(key, results.get(key, ""))
 
         result = doc_builder.build(file_summaries)
 
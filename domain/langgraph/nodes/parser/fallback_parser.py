@@ -1,30 +1,71 @@
-from typing import Dict, Any
+import os
+from bisect import bisect_left
+from typing import Callable, Dict, Any, Iterator, Tuple
 import re
 from .utils import extract_comments
 
+# 이보다 큰 파일(생성/압축 코드 등)은 언어별 정규식 파싱 없이 parse_generic으로 처리 (최악의 경우 파싱 시간 상한)
+MAX_PARSE_CHARS = int(os.getenv("FALLBACK_PARSER_MAX_CHARS", str(512 * 1024)))
 
-def parse_python_fallback(content: str, file_info: Dict[str, Any]) -> Dict[str, Any]:
-    function_pattern = re.compile(r'^def\s+(\w+)\s*\([^)]*\):', re.MULTILINE)
-    class_pattern = re.compile(r'^class\s+(\w+).*?:', re.MULTILINE)
-    import_pattern = re.compile(r'^(import\s+.+|from\s+.+\s+import\s+.+)', re.MULTILINE)
+# 정규식은 모듈 로드 시 한 번만 컴파일
+# (Python 패턴은 줄 머리 위치에서 match로만 쓰므로 ^/MULTILINE 불필요)
+_PY_FUNC_RE = re.compile(r'def\s+(\w+)\s*\([^)]*\):')
+_PY_CLASS_RE = re.compile(r'class\s+(\w+).*?:')
+_PY_IMPORT_RE = re.compile(r'(import\s+.+|from\s+.+\s+import\s+.+)')
+
+# 'const x = ... =>'의 화살표 부분은 정규식(.*?=>) 대신 같은 줄에서 str.find로 확인 (긴 한 줄 코드의 역추적 방지)
+_JS_FUNC_RE = re.compile(r'function\s+(\w+)|const\s+(\w+)\s*=|(\w+)\s*:\s*function')
+_JS_CLASS_RE = re.compile(r'class\s+(\w+)')
+_JS_IMPORT_RE = re.compile(r'import.*?from\s+[\'\"]([^\'\"]+)[\'\"]|import\s+[\'\"]([^\'\"]+)[\'\"]')
+
+_JAVA_METHOD_RE = re.compile(r'(public|private|protected).*?\s+(\w+)\s*\([^)]*\)\s*{')
+_JAVA_CLASS_RE = re.compile(r'(public\s+)?class\s+(\w+)')
+_JAVA_IMPORT_RE = re.compile(r'import\s+([^;]+);')
+
+
+def _line_lookup(content: str) -> Callable[[int], int]:
+    """문자 오프셋 -> 1부터 시작하는 줄 번호 (개행 위치를 한 번만 모아 두고 이분 탐색)"""
+    newlines = []
+    find = content.find
+    pos = find('\n')
+    while pos != -1:
+        newlines.append(pos)
+        pos = find('\n', pos + 1)
+    # 오프셋 앞에 있는 개행 수 + 1 == content[:offset].count('\n') + 1
+    return lambda offset: bisect_left(newlines, offset) + 1
 
+
+def parse_python_fallback(content: str, file_info: Dict[str, Any]) -> Dict[str, Any]:
     functions = []
     classes = []
     imports = []
     lines = content.splitlines()
 
-    for m in function_pattern.finditer(content):
-        name = m.group(1)
-        line = content[:m.start()].count('\n') + 1
-        functions.append({"name": name, "line_start": line, "line_end": line + 10, "docstring": ""})
-
-    for m in class_pattern.finditer(content):
-        name = m.group(1)
-        line = content[:m.start()].count('\n') + 1
-        classes.append({"name": name, "line_start": line, "line_end": line + 20, "methods": []})
-
-    for m in import_pattern.finditer(content):
-        imports.append(m.group(1).strip())
+    # 줄 단위 한 번 순회: 줄 머리 startswith로 후보만 골라 해당 위치에서 정규식 match
+    # (정규식은 원래처럼 전체 content에 대해 match하므로 여러 줄에 걸친 시그니처도 동일하게 인식,
+    #  패턴별로 직전 매치 끝 이전에서 시작하는 줄은 건너뛰어 finditer와 같은 결과 유지)
+    func_end = class_end = import_end = 0
+    offset = 0
+    for lineno, line in enumerate(content.split('\n'), 1):
+        if line.startswith("def"):
+            if offset >= func_end:
+                m = _PY_FUNC_RE.match(content, offset)
+                if m:
+                    functions.append({"name": m.group(1), "line_start": lineno, "line_end": lineno + 10, "docstring": ""})
+                    func_end = m.end()
+        elif line.startswith("class"):
+            if offset >= class_end:
+                m = _PY_CLASS_RE.match(content, offset)
+                if m:
+                    classes.append({"name": m.group(1), "line_start": lineno, "line_end": lineno + 20, "methods": []})
+                    class_end = m.end()
+        elif line.startswith(("import", "from")):
+            if offset >= import_end:
+                m = _PY_IMPORT_RE.match(content, offset)
+                if m:
+                    imports.append(m.group(1).strip())
+                    import_end = m.end()
+        offset += len(line) + 1
 
     return {
         "file_path": file_info.get("path", ""),
@@ -39,28 +80,61 @@ def parse_python_fallback(content: str, file_info: Dict[str, Any]) -> Dict[str,
     }
 
 
-def parse_javascript_fallback(content: str, file_info: Dict[str, Any]) -> Dict[str, Any]:
-    function_pattern = re.compile(r'function\s+(\w+)|const\s+(\w+)\s*=.*?=>|(\w+)\s*:\s*function')
-    class_pattern = re.compile(r'class\s+(\w+)')
-    import_pattern = re.compile(r'import.*?from\s+[\'\"]([^\'\"]+)[\'\"]|import\s+[\'\"]([^\'\"]+)[\'\"]')
+def _scan_js_functions(content: str) -> Iterator[Tuple[int, str]]:
+    """JS 함수 선언 위치/이름 탐색 (function 선언, 화살표 함수 const, 객체 메서드)
+
+    r'...|const\s+(\w+)\s*=.*?=>|...'를 finditer로 돌리던 것과 같은 결과를 내되,
+    const 뒤의 '=>'는 줄 끝까지 한 번만 찾아 보고 없으면 다음 위치부터 다시 탐색
+    """
+    search = _JS_FUNC_RE.search
+    find = content.find
+    size = len(content)
+    pos = 0
+    # 다음 개행/'=>' 위치를 캐시해 두고 지나쳤을 때만 다시 찾음 (한 줄에 const가 많아도 선형)
+    next_newline = next_arrow = -1
+    while True:
+        m = search(content, pos)
+        if m is None:
+            return
+        if m.group(2) is None:
+            yield m.start(), m.group(1) or m.group(3)
+            pos = m.end()
+            continue
+        end = m.end()
+        if next_newline < end:
+            next_newline = find('\n', end)
+            if next_newline == -1:
+                next_newline = size
+        if next_arrow < end:
+            next_arrow = find('=>', end)
+            if next_arrow == -1:
+                next_arrow = size
+        arrow = next_arrow if next_arrow < next_newline else -1
+        if arrow == -1:
+            # 같은 줄에 '=>'가 없으면 이 위치의 매치는 실패 -> 한 글자 뒤부터 계속
+            pos = m.start() + 1
+            continue
+        yield m.start(), m.group(2)
+        pos = arrow + 2
+
 
+def parse_javascript_fallback(content: str, file_info: Dict[str, Any]) -> Dict[str, Any]:
     functions = []
     classes = []
     imports = []
     lines = content.splitlines()
+    line_of = _line_lookup(content)
 
-    for m in function_pattern.finditer(content):
-        name = m.group(1) or m.group(2) or m.group(3)
-        if name:
-            line = content[:m.start()].count('\n') + 1
-            functions.append({"name": name, "line_start": line, "line_end": line + 5, "docstring": ""})
+    for start, name in _scan_js_functions(content):
+        line = line_of(start)
+        functions.append({"name": name, "line_start": line, "line_end": line + 5, "docstring": ""})
 
-    for m in class_pattern.finditer(content):
+    for m in _JS_CLASS_RE.finditer(content):
         name = m.group(1)
-        line = content[:m.start()].count('\n') + 1
+        line = line_of(m.start())
         classes.append({"name": name, "line_start": line, "line_end": line + 10, "methods": []})
 
-    for m in import_pattern.finditer(content):
+    for m in _JS_IMPORT_RE.finditer(content):
         imp = m.group(1) or m.group(2)
         if imp:
             imports.append(f"import from '{imp}'")
@@ -79,26 +153,23 @@ def parse_javascript_fallback(content: str, file_info: Dict[str, Any]) -> Dict[s
 
 
 def parse_java_fallback(content: str, file_info: Dict[str, Any]) -> Dict[str, Any]:
-    method_pattern = re.compile(r'(public|private|protected).*?\s+(\w+)\s*\([^)]*\)\s*{')
-    class_pattern = re.compile(r'(public\s+)?class\s+(\w+)')
-    import_pattern = re.compile(r'import\s+([^;]+);')
-
     functions = []
     classes = []
     imports = []
     lines = content.splitlines()
+    line_of = _line_lookup(content)
 
-    for m in method_pattern.finditer(content):
+    for m in _JAVA_METHOD_RE.finditer(content):
         name = m.group(2)
-        line = content[:m.start()].count('\n') + 1
+        line = line_of(m.start())
         functions.append({"name": name, "line_start": line, "line_end": line + 5, "docstring": ""})
 
-    for m in class_pattern.finditer(content):
+    for m in _JAVA_CLASS_RE.finditer(content):
         name = m.group(2)
-        line = content[:m.start()].count('\n') + 1
+        line = line_of(m.start())
         classes.append({"name": name, "line_start": line, "line_end": line + 20, "methods": []})
 
-    for m in import_pattern.finditer(content):
+    for m in _JAVA_IMPORT_RE.finditer(content):
         imports.append(m.group(1).strip())
 
     return {
@@ -116,6 +187,7 @@ def parse_java_fallback(content: str, file_info: Dict[str, Any]) -> Dict[str, An
 
 def parse_generic(content: str, file_info: Dict[str, Any]) -> Dict[str, Any]:
     lines = content.splitlines()
+    # 거대 파일도 주석 탐색은 앞부분 MAX_PARSE_CHARS까지만
     return {
         "file_path": file_info.get("path", ""),
         "language": file_info.get("language", "unknown"),
@@ -123,7 +195,7 @@ def parse_generic(content: str, file_info: Dict[str, Any]) -> Dict[str, Any]:
         "functions": [],
         "classes": [],
         "imports": [],
-        "comments": extract_comments(content),
+        "comments": extract_comments(content[:MAX_PARSE_CHARS]),
         "complexity_score": 1,
         "loc": len(lines),
     }
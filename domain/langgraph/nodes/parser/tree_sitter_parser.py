@@ -1,95 +1,136 @@
-from typing import Dict, Any, List, Optional
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
+import importlib
 import importlib.util
+import threading
+from functools import lru_cache
 from .fallback_parser import (
+    MAX_PARSE_CHARS,
     parse_python_fallback,
     parse_javascript_fallback,
     parse_java_fallback,
     parse_generic,
 )
 
+if TYPE_CHECKING:
+    from tree_sitter import Language, Parser
 
-def _try_tree_sitter_parse(content: str, file_info: Dict[str, Any], language_name: str) -> Optional[Dict[str, Any]]:
+
+# 스레드별 Parser 재사용 (Parser는 스레드 간 공유가 안전하지 않으므로 threading.local에 언어별로 보관)
+_TLS = threading.local()
+
+
+# 언어 이름 -> (tree-sitter 언어 모듈, Language 포인터를 반환하는 함수 이름)
+_LANGUAGE_MODULES = {
+    "python": ("tree_sitter_python", "language"),
+    "javascript": ("tree_sitter_javascript", "language"),
+    "typescript": ("tree_sitter_typescript", "language_typescript"),
+    "java": ("tree_sitter_java", "language"),
+    "cpp": ("tree_sitter_cpp", "language"),
+    "c": ("tree_sitter_cpp", "language"),
+    "go": ("tree_sitter_go", "language"),
+}
+
+
+@lru_cache(maxsize=None)
+def _load_language(language_name: str) -> Optional["Language"]:
+    """언어 이름 -> tree-sitter Language (설치된 경우만, 프로세스당 1회 로드 - 미설치 결과도 캐시)"""
+    spec = _LANGUAGE_MODULES.get(language_name)
+    if spec is None:
+        return None
     try:
-        from tree_sitter import Parser, Language
-        # 각 언어 모듈은 선택적으로 설치되어 있을 수 있음
-        lang: Optional[Language] = None
-        if language_name == "python":
-            if importlib.util.find_spec("tree_sitter_python") is None:
-                return None
-            import tree_sitter_python as tsp  # type: ignore
-            lang = Language(tsp.language())
-        elif language_name == "javascript":
-            if importlib.util.find_spec("tree_sitter_javascript") is None:
-                return None
-            import tree_sitter_javascript as tsjs  # type: ignore
-            lang = Language(tsjs.language())
-        elif language_name == "typescript":
-            if importlib.util.find_spec("tree_sitter_typescript") is None:
-                return None
-            import tree_sitter_typescript as tsts  # type: ignore
-            lang = Language(tsts.language_typescript())
-        elif language_name == "java":
-            if importlib.util.find_spec("tree_sitter_java") is None:
-                return None
-            import tree_sitter_java as tsj  # type: ignore
-            lang = Language(tsj.language())
-        elif language_name in ("cpp", "c"):
-            if importlib.util.find_spec("tree_sitter_cpp") is None:
-                return None
-            import tree_sitter_cpp as tscpp  # type: ignore
-            lang = Language(tscpp.language())
-        elif language_name == "go":
-            if importlib.util.find_spec("tree_sitter_go") is None:
-                return None
-            import tree_sitter_go as tsgo  # type: ignore
-            lang = Language(tsgo.language())
-        else:
-            return None
+        from tree_sitter import Language
+    except ImportError:
+        return None
+    # 각 언어 모듈은 선택적으로 설치되어 있을 수 있음
+    module_name, attr = spec
+    if importlib.util.find_spec(module_name) is None:
+        return None
+    module = importlib.import_module(module_name)
+    return Language(getattr(module, attr)())
 
-        if not lang:
-            return None
 
+# 언어별로 추출할 tree-sitter 노드 타입
+_NODE_PATTERNS = {
+    "python": {
+        "functions": ["function_definition"],
+        "classes": ["class_definition"],
+        "imports": ["import_statement", "import_from_statement"],
+    },
+    "javascript": {
+        "functions": ["function_declaration", "arrow_function", "method_definition"],
+        "classes": ["class_declaration"],
+        "imports": ["import_statement"],
+    },
+    "typescript": {
+        "functions": ["function_declaration", "arrow_function", "method_definition", "function_signature"],
+        "classes": ["class_declaration", "interface_declaration"],
+        "imports": ["import_statement"],
+    },
+    "java": {
+        "functions": ["method_declaration", "constructor_declaration"],
+        "classes": ["class_declaration", "interface_declaration"],
+        "imports": ["import_declaration"],
+    },
+    "cpp": {
+        "functions": ["function_definition", "function_declarator"],
+        "classes": ["class_specifier", "struct_specifier"],
+        "imports": ["preproc_include"],
+    },
+    "go": {
+        "functions": ["function_declaration", "method_declaration"],
+        "classes": ["type_declaration"],
+        "imports": ["import_declaration"],
+    },
+}
+
+
+def _build_node_kinds() -> Dict[str, Dict[str, str]]:
+    """언어별 노드 타입 -> 종류(functions/classes/imports) 역색인 - 순회 중 노드마다 dict 조회 한 번으로 판별
+    (한 타입이 여러 종류에 있으면 functions > classes > imports 순으로 우선)"""
+    node_kinds: Dict[str, Dict[str, str]] = {}
+    for language_name, groups in _NODE_PATTERNS.items():
+        kinds = node_kinds[language_name] = {}
+        for kind in ("functions", "classes", "imports"):
+            for node_type in groups.get(kind, ()):
+                kinds.setdefault(node_type, kind)
+    return node_kinds
+
+
+_NODE_KINDS = _build_node_kinds()
+
+
+def _get_parser(language_name: str) -> Optional["Parser"]:
+    """현재 스레드의 언어별 Parser 반환 (없으면 생성 후 보관, 파싱 전 reset)"""
+    lang = _load_language(language_name)
+    if lang is None:
+        return None
+    parsers = getattr(_TLS, "parsers", None)
+    if parsers is None:
+        parsers = _TLS.parsers = {}
+    parser = parsers.get(language_name)
+    if parser is None:
+        from tree_sitter import Parser
         parser = Parser()
         parser.language = lang
+        parsers[language_name] = parser
+    else:
+        parser.reset()
+    return parser
+
+
+def _try_tree_sitter_parse(content: str, file_info: Dict[str, Any], language_name: str) -> Optional[Dict[str, Any]]:
+    try:
+        parser = _get_parser(language_name)
+        if parser is None:
+            return None
+
         tree = parser.parse(bytes(content, "utf8"))
-        root = tree.root_node
 
         functions: List[Dict[str, Any]] = []
         classes: List[Dict[str, Any]] = []
         imports: List[str] = []
 
-        patterns = {
-            "python": {
-                "functions": ["function_definition"],
-                "classes": ["class_definition"],
-                "imports": ["import_statement", "import_from_statement"],
-            },
-            "javascript": {
-                "functions": ["function_declaration", "arrow_function", "method_definition"],
-                "classes": ["class_declaration"],
-                "imports": ["import_statement"],
-            },
-            "typescript": {
-                "functions": ["function_declaration", "arrow_function", "method_definition", "function_signature"],
-                "classes": ["class_declaration", "interface_declaration"],
-                "imports": ["import_statement"],
-            },
-            "java": {
-                "functions": ["method_declaration", "constructor_declaration"],
-                "classes": ["class_declaration", "interface_declaration"],
-                "imports": ["import_declaration"],
-            },
-            "cpp": {
-                "functions": ["function_definition", "function_declarator"],
-                "classes": ["class_specifier", "struct_specifier"],
-                "imports": ["preproc_include"],
-            },
-            "go": {
-                "functions": ["function_declaration", "method_declaration"],
-                "classes": ["type_declaration"],
-                "imports": ["import_declaration"],
-            },
-        }.get(language_name, {})
+        kinds = _NODE_KINDS.get(language_name, {})
 
         def id_text(node) -> str:
             for ch in node.children:
@@ -97,28 +138,38 @@ def _try_tree_sitter_parse(content: str, file_info: Dict[str, Any], language_nam
                     return ch.text.decode(errors="ignore")
             return "unknown"
 
-        def walk(node):
-            t = node.type
-            if t in patterns.get("functions", []):
+        def visit(node):
+            kind = kinds.get(node.type)
+            if kind is None:
+                return
+            if kind == "functions":
                 functions.append({
                     "name": id_text(node),
                     "line_start": node.start_point[0] + 1,
                     "line_end": node.end_point[0] + 1,
                     "docstring": "",
                 })
-            elif t in patterns.get("classes", []):
+            elif kind == "classes":
                 classes.append({
                     "name": id_text(node),
                     "line_start": node.start_point[0] + 1,
                     "line_end": node.end_point[0] + 1,
                     "methods": [],
                 })
-            elif t in patterns.get("imports", []):
+            else:
                 imports.append(node.type)
-            for c in node.children:
-                walk(c)
 
-        walk(root)
+        # 재귀 + node.children 리스트 생성 대신 TreeCursor로 전위 순회 (깊은 중첩에서도 RecursionError 없음)
+        cursor = tree.walk()
+        done = False
+        while not done:
+            visit(cursor.node)
+            if cursor.goto_first_child():
+                continue
+            while not cursor.goto_next_sibling():
+                if not cursor.goto_parent():
+                    done = True
+                    break
 
         return {
             "file_path": file_info.get("path", ""),
@@ -139,7 +190,9 @@ def parse_with_best_effort(content: str, file_info: Dict[str, Any], language_nam
     ts = _try_tree_sitter_parse(content, file_info, language_name)
     if ts is not None:
         return ts
-    # fallback
+    # fallback (크기 상한을 넘는 파일은 정규식 파싱 생략)
+    if len(content) > MAX_PARSE_CHARS:
+        return parse_generic(content, file_info)
     if language_name == "python":
         return parse_python_fallback(content, file_info)
     if language_name in ("javascript", "typescript"):
@@ -1,17 +1,33 @@
 from typing import List
 import re
 
+_HASH_COMMENT_RE = re.compile(r'#\s*(.+)')
+_LINE_COMMENT_RE = re.compile(r'//\s*(.+)')
+_BLOCK_COMMENT_RE = re.compile(r'/\*\s*(.+?)\s*\*/', re.DOTALL)
+_WHITESPACE_RE = re.compile(r'\s+')
 
-def extract_comments(content: str) -> List[str]:
-    """간단한 주석 추출 (최대 10개)"""
+
+def extract_comments(content: str, limit: int = 10) -> List[str]:
+    """간단한 주석 추출 (최대 limit개)
+
+    # 주석 -> // 주석 -> 블록 주석 순서로 모으되, limit개가 차면 남은 탐색을 건너뜀
+    (findall로 파일 전체 매치를 만든 뒤 자르던 것과 결과는 같고 작업량은 limit에 비례)
+    """
     comments: List[str] = []
-    # Python/Shell 스타일 주석 (#)
-    comments.extend([c.strip() for c in re.findall(r'#\s*(.+)', content) if c.strip()])
-    # C/JS 한 줄 주석
-    comments.extend([c.strip() for c in re.findall(r'//\s*(.+)', content) if c.strip()])
-    # C/JS 블록 주석
-    for block in re.findall(r'/\*\s*(.+?)\s*\*/', content, re.DOTALL):
-        clean = re.sub(r'\s+', ' ', block).strip()
+    # Python/Shell 스타일 주석 (#), C/JS 한 줄 주석
+    for pattern in (_HASH_COMMENT_RE, _LINE_COMMENT_RE):
+        for m in pattern.finditer(content):
+            c = m.group(1).strip()
+            if c:
+                comments.append(c)
+                if len(comments) >= limit:
+                    return comments
+    # C/JS 블록 주석 - 마지막 '*/' 뒤의 닫히지 않은 '/*'마다 끝까지 훑는 일이 없도록 그 앞까지만 탐색
+    block_end = content.rfind('*/')
+    for m in _BLOCK_COMMENT_RE.finditer(content, 0, block_end + 2 if block_end != -1 else 0):
+        clean = _WHITESPACE_RE.sub(' ', m.group(1)).strip()
         if clean:
             comments.append(clean)
-    return comments[:10]
+            if len(comments) >= limit:
+                break
+    return comments
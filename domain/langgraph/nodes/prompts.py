@@ -12,6 +12,7 @@ Use get_prompt_set(version) to obtain (system_prompt, builders).
 from __future__ import annotations
 
 import json
+import threading
 from typing import List, Dict, Any, Callable, Tuple
 
 MAX_FILES = 40  # max file entries in prompt
@@ -151,12 +152,20 @@ def get_prompt_set(version: str = DEFAULT_VERSION) -> Dict[str, Tuple[str, Calla
     if version not in PROMPT_VERSIONS:
         version = DEFAULT_VERSION
     system = build_system_prompt(version)
+    # 세 섹션 builder가 같은 files로 (병렬) 호출되므로 compact + JSON 직렬화는 한 번만 수행해 공유
+    memo_lock = threading.Lock()
+    memo: List[Any] = [None, None]  # [files 객체, data_json]
+    def data_json_for(files: List[Dict[str, Any]]) -> str:
+        with memo_lock:
+            if memo[0] is not files:
+                memo[0], memo[1] = files, json.dumps(_compact_files(files), ensure_ascii=False)
+            return memo[1]
     def overview_builder(files: List[Dict[str, Any]], structure: Dict[str, Any], repo: str):
-        return _overview_task(repo, json.dumps(_compact_files(files), ensure_ascii=False), version)
+        return _overview_task(repo, data_json_for(files), version)
     def arch_builder(files: List[Dict[str, Any]], structure: Dict[str, Any], repo: str):
-        return _architecture_task(json.dumps(_compact_files(files), ensure_ascii=False), version)
+        return _architecture_task(data_json_for(files), version)
     def modules_builder(files: List[Dict[str, Any]], structure: Dict[str, Any], repo: str):
-        return _modules_task(json.dumps(_compact_files(files), ensure_ascii=False), version)
+        return _modules_task(data_json_for(files), version)
     return {
         "overview": (system, overview_builder),
         "architecture": (system, arch_builder),
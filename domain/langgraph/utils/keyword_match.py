@@ -0,0 +1,38 @@
+import re
+from typing import Any, Callable, Iterable, Optional, Sequence, Tuple
+
+# 우선순위가 있는 다중 키워드 포함 검사 유틸
+# any(k in text for k in keywords)를 규칙마다 반복하는 대신 전체 키워드를 하나의 정규식으로 묶어
+# 문자열을 한 번만 훑고, 등장한 키워드 중 가장 앞선 규칙의 값을 돌려준다.
+
+
+def first_keyword_match(rules: Sequence[Tuple[Any, Iterable[str]]]) -> Callable[[str], Optional[Any]]:
+    """(값, 키워드들) 규칙 목록으로 매칭 함수 생성
+
+    반환된 함수는 text에 부분 문자열로 포함된 키워드 중 가장 앞선 규칙의 값을, 없으면 None을 반환
+    (규칙을 순서대로 any(k in text ...) 검사하던 것과 결과가 같음)
+    """
+    values = [value for value, _ in rules]
+    priority = {}
+    for idx, (_, keywords) in enumerate(rules):
+        for kw in keywords:
+            priority.setdefault(kw, idx)
+    if not priority:
+        return lambda text: None
+
+    # 같은 위치에서는 긴 키워드만 잡히므로 접두 키워드의 우선순위까지 합쳐 둠
+    resolved = {kw: min(p for other, p in priority.items() if kw.startswith(other)) for kw in priority}
+    alternation = "|".join(re.escape(kw) for kw in sorted(resolved, key=len, reverse=True))
+    pattern = re.compile(f"(?=({alternation}))")
+
+    def match(text: str) -> Optional[Any]:
+        best = None
+        for m in pattern.finditer(text):
+            p = resolved[m.group(1)]
+            if best is None or p < best:
+                best = p
+                if p == 0:
+                    break
+        return None if best is None else values[best]
+
+    return match
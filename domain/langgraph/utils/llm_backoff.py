@@ -1,3 +1,4 @@
+import asyncio
 import os
 import time
 import random
@@ -5,7 +6,7 @@ from typing import Any, Sequence
 from langchain_core.messages import BaseMessage
 
 # 간단한 레이트리밋 / 일시적 오류 재시도 유틸
-# LangChain OpenAI ChatOpenAI.invoke 호출을 감싸 사용
+# LangChain OpenAI ChatOpenAI.invoke / ainvoke 호출을 감싸 사용
 # 환경변수:
 #   LLM_MAX_RETRIES (기본 3)
 #   LLM_BASE_BACKOFF_SECONDS (기본 1)
@@ -26,10 +27,22 @@ def _is_retryable_error(err: Exception) -> bool:
     return False
 
 
+def _retry_settings() -> tuple[int, float, float]:
+    return (
+        int(os.getenv("LLM_MAX_RETRIES", "3")),
+        float(os.getenv("LLM_BASE_BACKOFF_SECONDS", "1")),
+        float(os.getenv("LLM_MAX_BACKOFF_SECONDS", "10")),
+    )
+
+
+def _backoff_delay(attempt: int, base: float, max_backoff: float) -> float:
+    delay = min(max_backoff, base * (2 ** (attempt - 1)))
+    # Jitter: 0.8 ~ 1.3배
+    return delay * random.uniform(0.8, 1.3)
+
+
 def invoke_with_retry(llm: Any, messages: Sequence[BaseMessage]) -> Any:
-    max_retries = int(os.getenv("LLM_MAX_RETRIES", "3"))
-    base = float(os.getenv("LLM_BASE_BACKOFF_SECONDS", "1"))
-    max_backoff = float(os.getenv("LLM_MAX_BACKOFF_SECONDS", "10"))
+    max_retries, base, max_backoff = _retry_settings()
 
     attempt = 0
     while True:
@@ -39,8 +52,19 @@ def invoke_with_retry(llm: Any, messages: Sequence[BaseMessage]) -> Any:
             attempt += 1
             if attempt > max_retries or not _is_retryable_error(e):
                 raise
-            delay = min(max_backoff, base * (2 ** (attempt - 1)))
-            # Jitter: 0.8 ~ 1.3배
-            delay *= random.uniform(0.8, 1.3)
-            time.sleep(delay)
+            time.sleep(_backoff_delay(attempt, base, max_backoff))
 
+
+async def ainvoke_with_retry(llm: Any, messages: Sequence[BaseMessage]) -> Any:
+    """invoke_with_retry의 async 버전: 백오프 대기 중 스레드를 점유하지 않음"""
+    max_retries, base, max_backoff = _retry_settings()
+
+    attempt = 0
+    while True:
+        try:
+            return await llm.ainvoke(messages)
+        except Exception as e:  # Broad catch; refine if needed
+            attempt += 1
+            if attempt > max_retries or not _is_retryable_error(e):
+                raise
+            await asyncio.sleep(_backoff_delay(attempt, base, max_backoff))
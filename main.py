@@ -8,13 +8,29 @@ PROJECT_ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
 if PROJECT_ROOT_DIR not in sys.path:
     sys.path.append(PROJECT_ROOT_DIR)
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
+from app.logging_config import get_logger, shutdown_logging
+from database import ensure_indexes
 from domain.user import git_router
 from domain.document import document_router
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 로깅 큐 리스너 시작 / 기존 DB에 없는 인덱스 생성 / 종료 시 공용 HTTP 클라이언트 정리 및 남은 로그 기록
+    get_logger()
+    await asyncio.to_thread(ensure_indexes)
+    yield
+    await document_router.GITHUB_CLIENT.aclose()
+    shutdown_logging()
+
+
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://127.0.0.1:5173",
@@ -27,6 +43,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 브라우저 프론트엔드가 목록 API의 다음 페이지 커서 헤더를 읽을 수 있도록 노출
+    expose_headers=["X-Next-Cursor"],
 )
 
 # 라우터 등록
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, JSON, Index, text, func
 from sqlalchemy.orm import relationship
-from datetime import datetime, timezone
+from datetime import datetime
 
 from database import Base
 
@@ -92,6 +92,10 @@ class FileChange(Base):
 
 class Document(Base):
     __tablename__ = "documents"
+    __table_args__ = (
+        # list_documents: repository_name/status 필터 + created_at DESC 정렬을 인덱스 역순 스캔으로 처리
+        Index("ix_doc_repo_status_created", "repository_name", "status", text("created_at DESC")),
+    )
 
     id = Column(Integer, primary_key=True)
     title = Column(String(500), nullable=False)
@@ -103,8 +107,11 @@ class Document(Base):
     repository_name = Column(String(255))
     generation_metadata = Column(JSON)  # LLM 처리 메타데이터
     code_change_id = Column(Integer, ForeignKey("code_changes.id"))
-    created_at = Column(DateTime, default=datetime.now(timezone.utc))
-    updated_at = Column(DateTime, default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    # 생성 시각은 insert마다 계산 (keyset 커서와 같은 마이크로초 형식 유지, ORM 밖 insert는 server_default)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
+    # 갱신 시각은 DB가 채움 (UPDATE 파라미터로 Python 타임스탬프를 보내지 않음)
+    # server_default는 새로 만든 테이블에만 적용되므로 기존 DB를 위해 insert 시에도 now()를 직접 넣음
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
 
     # 관계 설정
     code_change = relationship("CodeChange", back_populates="document")
\ No newline at end of file